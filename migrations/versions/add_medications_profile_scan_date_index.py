@@ -0,0 +1,32 @@
+"""Add composite index for per-profile medication listings
+
+Revision ID: medications_profile_scan_date
+Revises: add_users_profiles
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "medications_profile_scan_date"
+down_revision: Union[str, None] = "add_users_profiles"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Newest-first listings and keyset pagination per profile
+    op.create_index(
+        "idx_medications_profile_scan_date",
+        "medications",
+        ["profile_id", sa.text("scan_date DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_medications_profile_scan_date", table_name="medications")
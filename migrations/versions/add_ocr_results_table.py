@@ -0,0 +1,49 @@
+"""Add table caching OCR and NER results by image digest
+
+Revision ID: add_ocr_results
+Revises: medications_profile_scan_date
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_ocr_results"
+down_revision: Union[str, None] = "medications_profile_scan_date"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ocr_results",
+        sa.Column(
+            "digest",
+            sa.String(length=64),
+            nullable=False,
+            comment="SHA-256 hex digest of the image content",
+        ),
+        sa.Column(
+            "ocr_text",
+            sa.Text(),
+            nullable=False,
+            comment="Text extracted from the image by OCR",
+        ),
+        sa.Column(
+            "entities",
+            sa.JSON(),
+            nullable=True,
+            comment="Medical entities extracted from the text by NER",
+        ),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("updated_at", sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint("digest"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ocr_results")
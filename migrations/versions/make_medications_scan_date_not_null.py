@@ -0,0 +1,46 @@
+"""Make medications.scan_date non-nullable
+
+Revision ID: medications_scan_date_not_null
+Revises: add_ocr_results
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "medications_scan_date_not_null"
+down_revision: Union[str, None] = "add_ocr_results"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination cannot continue past a NULL scan_date; fall back to the creation time
+    op.execute(
+        "UPDATE medications "
+        "SET scan_date = COALESCE(created_at, timezone('utc', now())) "
+        "WHERE scan_date IS NULL"
+    )
+    op.alter_column(
+        "medications",
+        "scan_date",
+        existing_type=sa.TIMESTAMP(),
+        nullable=False,
+        server_default=sa.text("timezone('utc', now())"),
+        existing_comment="Date when the medication was scanned",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "medications",
+        "scan_date",
+        existing_type=sa.TIMESTAMP(),
+        nullable=True,
+        server_default=None,
+        existing_comment="Date when the medication was scanned",
+    )
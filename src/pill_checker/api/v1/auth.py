@@ -1,20 +1,50 @@
 """Authentication endpoints using FastAPI-Users."""
 
-from typing import Optional
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
-from pill_checker.api.v1.dependencies import get_db
 from pill_checker.core.logging_config import logger
 from pill_checker.models.user import User
 from pill_checker.schemas.user import UserCreate, UserRead, UserUpdate
-from pill_checker.services.auth_manager import auth_backend, fastapi_users, current_active_user
-from pill_checker.services.profile_service import ProfileService
+from pill_checker.services.auth_manager import (
+    UserManager,
+    auth_backend,
+    current_active_user,
+    fastapi_users,
+    get_user_manager,
+)
 
 # Create router
 router = APIRouter()
 
+# Serialized /me payloads and their ETags, keyed by the user fields they were built from
+_ME_CACHE_SIZE = 10000
+_me_cache: "OrderedDict[tuple, Tuple[bytes, str]]" = OrderedDict()
+
+
+def _user_payload(user: User) -> Tuple[bytes, str]:
+    """
+    Serialize a user as UserRead JSON, reusing the bytes while the fields are unchanged.
+
+    Returns:
+        The JSON payload and a weak ETag derived from it
+    """
+    key = tuple(getattr(user, field) for field in UserRead.model_fields)
+    cached = _me_cache.get(key)
+    if cached is not None:
+        _me_cache.move_to_end(key)
+        return cached
+
+    payload = UserRead.model_validate(user).model_dump_json().encode()
+    cached = (payload, f'W/"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"')
+    _me_cache[key] = cached
+    if len(_me_cache) > _ME_CACHE_SIZE:
+        _me_cache.popitem(last=False)
+    return cached
+
 # Include FastAPI-Users authentication routes
 # Register endpoint
 router.include_router(
@@ -51,8 +81,9 @@ router.include_router(
 
 @router.post("/register-with-profile", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 async def register_with_profile(
+    request: Request,
     user_create: UserCreate,
-    db: Session = Depends(get_db),
+    user_manager: UserManager = Depends(get_user_manager),
 ):
     """
     Register a new user and automatically create their profile.
@@ -61,28 +92,14 @@ async def register_with_profile(
     to automatically create a user profile.
     """
     try:
-        # Use FastAPI-Users to register the user
-        from pill_checker.services.auth_manager import get_user_db, get_user_manager
-
-        user_db_gen = get_user_db(db)
-        user_db = await user_db_gen.__anext__()
-
-        user_manager_gen = get_user_manager(user_db)
-        user_manager = await user_manager_gen.__anext__()
-
-        # Create user
-        user = await user_manager.create(user_create)
-
-        # Create profile
-        profile_service = ProfileService(db)
-        username = user_create.username if hasattr(user_create, 'username') else None
-        profile = profile_service.create_profile(user.id, username)
-
-        if not profile:
-            logger.warning(f"Profile creation failed for user {user.id}")
+        # User and profile rows are written in one transaction (see UserDatabase.create)
+        # safe=True drops is_superuser/is_active/is_verified sent by the client
+        user = await user_manager.create(user_create, safe=True, request=request)
 
         return UserRead.model_validate(user)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Registration with profile error: {e}")
         raise HTTPException(
@@ -93,7 +110,16 @@ async def register_with_profile(
 
 @router.get("/me", response_model=UserRead)
 async def get_current_user_info(
+    request: Request,
     user: User = Depends(current_active_user),
 ):
-    """Get current user information."""
-    return UserRead.model_validate(user)
+    """
+    Get current user information.
+
+    Responds with 304 Not Modified when the client's If-None-Match matches.
+    """
+    payload, etag = _user_payload(user)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
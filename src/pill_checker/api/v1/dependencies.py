@@ -16,57 +16,14 @@ def read_items(db: Session = Depends(get_db), user: dict = Depends(get_current_u
 ```
 """
 
-from typing import Any, Dict, Generator
+from typing import Dict
 
-from fastapi import Depends, Query
-from fastapi_users.db import SQLAlchemyUserDatabase
-from sqlalchemy.orm import Session
+from fastapi import Query
 
-from pill_checker.core.config import get_settings
-from pill_checker.core.database import SessionLocal
-from pill_checker.models.user import User
-
-# Settings instance
-settings = get_settings()
-
-
-# Database dependencies
-def get_db() -> Generator[Session, None, None]:
-    """
-    Create and yield a database session.
-
-    This dependency is used to create a new database session for each request,
-    ensuring that the session is properly closed after the request is processed.
-
-    Usage:
-        ```python
-        @router.get("/items")
-        def read_items(db: Session = Depends(get_db)):
-            return db.query(Item).all()
-        ```
-
-    Yields:
-        Session: SQLAlchemy database session
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-# User database dependency
-async def get_user_db(db: Session = Depends(get_db)) -> SQLAlchemyUserDatabase:
-    """
-    Get user database adapter for FastAPI-Users.
-
-    Args:
-        db: Database session
-
-    Yields:
-        SQLAlchemyUserDatabase: User database adapter
-    """
-    yield SQLAlchemyUserDatabase(db, User)
+# Session and user-database dependencies have a single implementation each;
+# they are re-exported here so routes can import everything from one place.
+from pill_checker.core.database import get_async_db, get_db  # noqa: F401
+from pill_checker.services.auth_manager import get_user_db  # noqa: F401
 
 
 # Pagination and filtering dependencies
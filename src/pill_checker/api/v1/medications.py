@@ -1,44 +1,192 @@
-from typing import List
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse
+from sqlalchemy import bindparam, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload
 
-from pill_checker.core.database import get_db
+from pill_checker.api.v1.dependencies import pagination_params
+from pill_checker.core.database import get_async_db, get_db
 from pill_checker.core.logging_config import logger
 from pill_checker.models.medication import Medication
+from pill_checker.models.ocr_result import OCRResult
 from pill_checker.schemas.medication import (
     MedicationCreate,
     MedicationResponse,
     PaginatedResponse,
 )
-from pill_checker.services.biomed_ner_client import get_ner_client, MedicalNERClient
+from pill_checker.services.biomed_ner_client import (
+    MedicalNERClient,
+    get_ner_client,
+    get_ner_executor,
+)
 from pill_checker.services.medication_processing import process_medication_text
-from pill_checker.services.ocr import get_ocr_client
+from pill_checker.services.ocr import OCRBatcher, get_ocr_batcher
 from pill_checker.services.session_service import get_current_user
 from pill_checker.services.storage import get_storage_service
 
 router = APIRouter()
 
+# Columns read by list endpoints. Fetching them as plain rows instead of ORM
+# instances skips identity-map and attribute-instrumentation overhead;
+# MedicationResponse validates rows through attribute access either way.
+_LIST_COLUMNS = (
+    Medication.id,
+    Medication.profile_id,
+    Medication.title,
+    Medication.scan_date,
+    Medication.active_ingredients,
+    Medication.scanned_text,
+    Medication.dosage,
+    Medication.prescription_details,
+    Medication.scan_url,
+    Medication.created_at,
+    Medication.updated_at,
+)
+
+# Fields of MedicationResponse, in order
+_RESPONSE_FIELDS = tuple(MedicationResponse.model_fields)
+
+
+def _row_payload(row) -> dict:
+    """Map a trusted database row to the MedicationResponse JSON shape without validating it."""
+    mapping = row._mapping
+    return {field: mapping[field] for field in _RESPONSE_FIELDS}
+
+
+# Read statements are built once; requests only bind their parameters
+_NEWEST_FIRST = (Medication.scan_date.desc(), Medication.id.desc())
+_OWNED = Medication.profile_id == bindparam("profile_id")
+
+_COUNT_STMT = select(func.count()).select_from(Medication).where(_OWNED)
+
+# The window count rides along with the page, saving a separate COUNT round-trip
+_PAGE_STMT = (
+    select(*_LIST_COLUMNS, func.count().over().label("total"))
+    .where(_OWNED)
+    .order_by(*_NEWEST_FIRST)
+    .offset(bindparam("skip"))
+    .limit(bindparam("size"))
+)
+
+# The total is not narrowed by the cursor, so it is counted in a subquery instead of a window
+_PAGE_AFTER_STMT = (
+    select(*_LIST_COLUMNS, _COUNT_STMT.correlate(None).scalar_subquery().label("total"))
+    .where(_OWNED)
+    .where(
+        tuple_(Medication.scan_date, Medication.id)
+        < tuple_(bindparam("after_scan_date"), bindparam("after_id"))
+    )
+    .order_by(*_NEWEST_FIRST)
+    .limit(bindparam("size"))
+)
+
+# Same order as the (profile_id, scan_date, id) index, so LIMIT stops after `limit` rows
+_RECENT_STMT = (
+    select(*_LIST_COLUMNS).where(_OWNED).order_by(*_NEWEST_FIRST).limit(bindparam("limit"))
+)
+
+# The response only needs columns; fail loudly rather than lazy-load a relationship
+_GET_STMT = (
+    select(Medication)
+    .where(Medication.id == bindparam("medication_id"), _OWNED)
+    .options(raiseload("*"))
+)
+
+_SCAN_URL_STMT = select(Medication.scan_url).where(
+    Medication.id == bindparam("medication_id"), _OWNED
+)
+
+
+# Uploads are copied to storage in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+async def _iter_upload(
+    upload: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Read an uploaded file from the start in fixed-size chunks."""
+    await upload.seek(0)
+    while chunk := await upload.read(chunk_size):
+        yield chunk
+
+
+def _digest_upload(upload: UploadFile) -> str:
+    """Return the SHA-256 hex digest of an uploaded file."""
+    upload.file.seek(0)
+    return hashlib.file_digest(upload.file, "sha256").hexdigest()
+
+
+async def _extract_entities(ner_client: MedicalNERClient, text: str) -> Optional[List[dict]]:
+    """Run NER on its executor, returning None if extraction fails."""
+    logger.info("Extracting medical entities with BiomedNER...")
+    try:
+        entities = await asyncio.get_running_loop().run_in_executor(
+            get_ner_executor(), ner_client.extract_entities, text
+        )
+    except Exception as ner_error:
+        logger.warning(f"NER extraction failed: {ner_error}. Continuing without NER data.")
+        return None
+    logger.info(f"NER extracted {len(entities)} entities")
+    return entities
+
+
+def _get_ocr_result(db: Session, digest: str) -> Optional[OCRResult]:
+    """Look up cached OCR and NER output for an image digest."""
+    return db.get(OCRResult, digest)
+
+
+def _save_medication(
+    db: Session, medication: Medication, ocr_result: Optional[OCRResult] = None
+) -> MedicationResponse:
+    """Persist a new medication, caching fresh OCR output, and return its response."""
+    db.add(medication)
+    if ocr_result is not None:
+        # A concurrent upload of the same image may have cached it first
+        db.execute(
+            pg_insert(OCRResult)
+            .values(
+                digest=ocr_result.digest,
+                ocr_text=ocr_result.ocr_text,
+                entities=ocr_result.entities,
+            )
+            .on_conflict_do_nothing(index_elements=[OCRResult.digest])
+        )
+    # The flush fills in the generated id and defaults. Reading them before the
+    # commit expires the instance saves a SELECT to load them back.
+    db.flush()
+    response = MedicationResponse.model_validate(medication)
+    db.commit()
+    return response
+
 
 @router.post("/upload", response_model=MedicationResponse)
 async def upload_medication(
     image: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
-    ocr_client=Depends(get_ocr_client),
+    ocr_batcher: OCRBatcher = Depends(get_ocr_batcher),
     ner_client: MedicalNERClient = Depends(get_ner_client),
 ):
     """
     Upload and process a medication image.
 
     This endpoint:
-    1. Uploads the image to storage
-    2. Extracts text using OCR
-    3. Identifies medical entities using BiomedNER
+    1. Extracts text using OCR
+    2. Identifies medical entities using BiomedNER
+    3. Uploads the image to storage, concurrently with step 2
     4. Structures the medication data
     5. Stores in database
 
+    OCR and NER output is cached by image digest, so re-uploads of the same
+    image skip steps 1 and 2.
+
     Returns:
         MedicationResponse with extracted medication details
     """
@@ -46,30 +194,40 @@ async def upload_medication(
         # Get storage service
         storage_service = get_storage_service()
 
-        # Upload image to local storage
+        # Where the image is kept in storage
         file_path = f"medications/{current_user['id']}/{image.filename}"
 
-        file_content = await image.read()
         logger.info(f"Processing medication image: {file_path}")
 
-        # Upload to storage
-        public_url = await storage_service.upload_file(
-            file_content, file_path, image.content_type
-        )
+        digest = await run_in_threadpool(_digest_upload, image)
 
-        # Step 1: Extract text with OCR
-        logger.info("Extracting text with OCR...")
-        ocr_text = ocr_client.read_text(file_content)
-        logger.info(f"OCR extracted text (length: {len(ocr_text)})")
+        new_ocr_result = None
+        cached = await run_in_threadpool(_get_ocr_result, db, digest)
+        if cached is not None:
+            logger.info(f"Reusing cached OCR and NER results for image {digest[:12]}")
+            ocr_text = cached.ocr_text
+            entities = cached.entities or []
+            public_url = await storage_service.upload_stream(
+                _iter_upload(image), file_path, image.content_type
+            )
+        else:
+            # Step 1: Extract text with OCR, reading the spooled upload directly
+            logger.info("Extracting text with OCR...")
+            await image.seek(0)
+            ocr_text = await ocr_batcher.read_text(image.file)
+            logger.info(f"OCR extracted text (length: {len(ocr_text)})")
 
-        # Step 2: Extract medical entities with NER
-        logger.info("Extracting medical entities with BiomedNER...")
-        try:
-            entities = ner_client.extract_entities(ocr_text)
-            logger.info(f"NER extracted {len(entities)} entities")
-        except Exception as ner_error:
-            logger.warning(f"NER extraction failed: {ner_error}. Continuing without NER data.")
-            entities = []
+            # Step 2: Extract medical entities with NER. OCR is done reading the
+            # upload, so streaming it to storage overlaps with the NER call.
+            public_url, entities = await asyncio.gather(
+                storage_service.upload_stream(_iter_upload(image), file_path, image.content_type),
+                _extract_entities(ner_client, ocr_text),
+            )
+            if entities is None:
+                entities = []
+            else:
+                # Only complete results are cached; NER failures are retried next time
+                new_ocr_result = OCRResult(digest=digest, ocr_text=ocr_text, entities=entities)
 
         # Step 3: Process and structure medication data
         title, active_ingredients, dosage, prescription_details = process_medication_text(
@@ -93,12 +251,11 @@ async def upload_medication(
         )
 
         medication = Medication(**medication_data.model_dump())
-        db.add(medication)
-        db.commit()
-        db.refresh(medication)
+        # Blocking DB round-trips run on the threadpool, not the event loop
+        response = await run_in_threadpool(_save_medication, db, medication, new_ocr_result)
 
-        logger.info(f"Successfully created medication record with ID: {medication.id}")
-        return MedicationResponse.model_validate(medication)
+        logger.info(f"Successfully created medication record with ID: {response.id}")
+        return response
 
     except HTTPException:
         # Re-raise HTTP exceptions as-is
@@ -112,75 +269,120 @@ async def upload_medication(
 
 
 @router.get("/list", response_model=PaginatedResponse)
-def list_medications(
-    db: Session = Depends(get_db),
+async def list_medications(
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
-    page: int = 1,
-    size: int = 10,
+    pagination: Dict[str, int] = Depends(pagination_params),
+    after_scan_date: Optional[datetime] = None,
+    after_id: Optional[int] = None,
 ):
-    """List all medications for the current user."""
-    # Calculate offset
-    skip = (page - 1) * size
-
-    count_stmt = (
-        select(func.count())
-        .select_from(Medication)
-        .where(Medication.profile_id == current_user["id"])
-    )
-    count_result = db.execute(count_stmt)
-    total = count_result.scalar_one()
-
-    stmt = (
-        select(Medication)
-        .where(Medication.profile_id == current_user["id"])
-        .offset(skip)
-        .limit(size)
-    )
-    result = db.execute(stmt)
-    medications = result.scalars().all()
-
-    return PaginatedResponse(
-        items=[MedicationResponse.model_validate(med) for med in medications],
-        total=total,
-        page=page,
-        size=size,
-        pages=(total + size - 1) // size,
+    """
+    List all medications for the current user, newest first.
+
+    Pages can be addressed by number, or by the ``next_cursor`` of the previous
+    page (``after_scan_date`` + ``after_id``). The cursor seeks straight to the
+    next rows through the (profile_id, scan_date, id) index instead of skipping
+    over every earlier row with OFFSET, so deep pages stay fast. Cursor pages
+    are reported with ``page`` set to null.
+    """
+    if (after_scan_date is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="after_scan_date and after_id must be given together",
+        )
+
+    page, size, skip = pagination["page"], pagination["size"], pagination["skip"]
+    owned = {"profile_id": current_user["id"]}
+
+    if after_scan_date is not None and after_scan_date.tzinfo is not None:
+        # scan_date is a naive UTC timestamp; asyncpg rejects aware datetimes for it
+        after_scan_date = after_scan_date.astimezone(timezone.utc).replace(tzinfo=None)
+
+    if after_id is not None:
+        params = {**owned, "after_scan_date": after_scan_date, "after_id": after_id, "size": size}
+        medications = (await db.execute(_PAGE_AFTER_STMT, params)).all()
+        beyond_first_row = True
+    else:
+        params = {**owned, "skip": skip, "size": size}
+        medications = (await db.execute(_PAGE_STMT, params)).all()
+        beyond_first_row = skip > 0
+
+    if medications:
+        total = medications[0].total
+    elif beyond_first_row:
+        # Past the last page there are no rows to carry the count
+        total = (await db.execute(_COUNT_STMT, owned)).scalar_one()
+    else:
+        total = 0
+
+    next_cursor = None
+    if len(medications) == size:
+        last = medications[-1]
+        next_cursor = {"after_scan_date": last.scan_date, "after_id": last.id}
+
+    # Same shape as PaginatedResponse, serialized by orjson without re-validation.
+    # A cursor page has no page number, since `page` was not used to fetch it.
+    return ORJSONResponse(
+        {
+            "items": [_row_payload(med) for med in medications],
+            "total": total,
+            "page": None if after_id is not None else page,
+            "size": size,
+            "pages": (total + size - 1) // size,
+            "next_cursor": next_cursor,
+        }
     )
 
 
 @router.get("/recent", response_model=List[MedicationResponse])
-def get_recent_medications(
-    db: Session = Depends(get_db),
+async def get_recent_medications(
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
     limit: int = 5,
 ):
     """Get recent medications for the current user."""
-    stmt = (
-        select(Medication)
-        .where(Medication.profile_id == current_user["id"])
-        .order_by(Medication.scan_date.desc())
-        .limit(limit)
-    )
-    result = db.execute(stmt)
-    medications = result.scalars().all()
+    params = {"profile_id": current_user["id"], "limit": limit}
+    medications = (await db.execute(_RECENT_STMT, params)).all()
 
-    return [MedicationResponse.model_validate(med) for med in medications]
+    return ORJSONResponse([_row_payload(med) for med in medications])
 
 
 @router.get("/{medication_id}", response_model=MedicationResponse)
-def get_medication_by_id(
+async def get_medication_by_id(
     medication_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """Get a specific medication by ID."""
-    stmt = select(Medication).where(
-        Medication.id == medication_id, Medication.profile_id == current_user["id"]
-    )
-    result = db.execute(stmt)
+    params = {"medication_id": medication_id, "profile_id": current_user["id"]}
+    result = await db.execute(_GET_STMT, params)
     medication = result.scalar_one_or_none()
 
     if not medication:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Medication not found")
 
     return MedicationResponse.model_validate(medication)
+
+
+@router.get("/{medication_id}/image", response_class=FileResponse)
+async def get_medication_image(
+    medication_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Get the scanned image of a specific medication.
+
+    The file is returned as a FileResponse, so it is sent with sendfile rather
+    than read into memory.
+    """
+    params = {"medication_id": medication_id, "profile_id": current_user["id"]}
+    scan_url = (await db.execute(_SCAN_URL_STMT, params)).scalar_one_or_none()
+
+    storage_service = get_storage_service()
+    # scan_url is the public URL built by StorageService.get_public_url
+    file_path = scan_url.removeprefix("/storage/") if scan_url else None
+    if not file_path or not await storage_service.path_exists(file_path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+
+    return FileResponse(storage_service.get_local_path(file_path))
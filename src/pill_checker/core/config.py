@@ -1,15 +1,21 @@
+import json
 import os
 from functools import lru_cache
-from typing import List, Optional
+from typing import Annotated, List, Optional
 
 from dotenv import load_dotenv
-from pydantic.v1 import BaseSettings, validator
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 # Load environment variables
 load_dotenv()
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        case_sensitive=True, env_file=".env", extra="ignore", frozen=True
+    )
+
     # Environment - Local Development Only
     APP_ENV: str = "development"  # Fixed to development as per requirements
     DEBUG: bool = True  # Enabled for local development
@@ -21,32 +27,62 @@ class Settings(BaseSettings):
     # Security
     SECRET_KEY: str = "test-secret-key"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 11520
+    TOKEN_CACHE_SIZE: int = 10000  # Verified JWTs remembered per process
+    TOKEN_CACHE_TTL_SECONDS: int = 60
 
     # CORS
-    BACKEND_CORS_ORIGINS: List[str] = []
+    BACKEND_CORS_ORIGINS: Annotated[List[str], NoDecode] = []
 
     # Security
-    TRUSTED_HOSTS: List[str] = ["localhost:8080", "127.0.0.1:8080"]
+    TRUSTED_HOSTS: Annotated[List[str], NoDecode] = ["localhost:8080", "127.0.0.1:8080"]
     RATE_LIMIT_PER_SECOND: int = 10
     RATE_LIMIT_PER_MINUTE: int = 100
     RATE_LIMIT_PER_HOUR: int = 1000
+    RATE_LIMIT_STORAGE_URI: str = "memory://"  # e.g. redis://localhost:6379/0 to share across workers
+    # Proxies whose X-Forwarded-For is trusted for the client address, e.g. the nginx container
+    FORWARDED_ALLOW_IPS: Annotated[List[str], NoDecode] = []
 
     # DB settings
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_HOST: str = "127.0.0.1"
-    POSTGRES_PORT: int = "54322"
+    POSTGRES_PORT: int = 54322
     POSTGRES_DB: str = "postgres"
+    # Each process opens a sync and an async engine; together they stay within 10 + 20 connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_ASYNC_POOL_SIZE: int = 5
+    DB_ASYNC_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # Seconds; replaces connections before server-side idle timeouts
+    DB_SLOW_QUERY_MS: int = 100  # Queries slower than this are logged; 0 disables
 
     # Storage Settings
     STORAGE_PATH: str = "./storage"
     STORAGE_BASE_URL: str = "http://localhost:8000"
+    SERVE_STATIC: bool = True  # Disable when a reverse proxy serves /static and /favicon.ico
+    STATIC_MAX_AGE: int = 86400  # Seconds browsers may cache static assets served in-process
+
+    # OCR Settings
+    OCR_GPU: bool = True  # Falls back to CPU when CUDA is unavailable
+    OCR_QUANTIZE: bool = True  # Dynamic INT8 quantization on CPU
+    OCR_FP16: bool = True  # Half-precision inference on CUDA
+    OCR_BATCH_SIZE: int = 16
+    OCR_BATCH_WAIT_MS: int = 30
+    OCR_WARMUP: bool = True  # Run a dummy batch at startup; disable in tests
+
+    # BiomedNER Settings
+    NER_WORKERS: int = 4
+    NER_CACHE_SIZE: int = 1024  # Texts whose entities are remembered per process; 0 disables
+    NER_CACHE_TTL_SECONDS: int = 3600
 
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "app.log"
+    LOG_BUFFER_SIZE: int = 512  # Records buffered per handler outside DEBUG; 0 disables
 
-    @validator("ACCESS_TOKEN_EXPIRE_MINUTES", pre=True)
+    @field_validator("ACCESS_TOKEN_EXPIRE_MINUTES", mode="before")
+    @classmethod
     def validate_token_expire(cls, v):
         """Validate and convert ACCESS_TOKEN_EXPIRE_MINUTES."""
         try:
@@ -54,24 +90,25 @@ class Settings(BaseSettings):
         except (ValueError, TypeError):
             return 11520
 
-    @validator("BACKEND_CORS_ORIGINS", "TRUSTED_HOSTS", pre=True)
+    @field_validator("BACKEND_CORS_ORIGINS", "TRUSTED_HOSTS", "FORWARDED_ALLOW_IPS", mode="before")
+    @classmethod
     def parse_string_list(cls, v):
-        """Parse comma-separated string to list."""
+        """Parse a JSON array or comma-separated string to list."""
         if isinstance(v, str):
-            try:
-                import json
-
+            v = v.strip()
+            # Only JSON arrays are decoded; plain lists skip the failing json.loads
+            if v.startswith("["):
                 return json.loads(v)
-            except json.JSONDecodeError:
-                return [item.strip() for item in v.split(",") if item.strip()]
+            return [item.strip() for item in v.split(",") if item.strip()]
         return v
 
-    @validator(
+    @field_validator(
         "RATE_LIMIT_PER_SECOND",
         "RATE_LIMIT_PER_MINUTE",
         "RATE_LIMIT_PER_HOUR",
-        pre=True,
+        mode="before",
     )
+    @classmethod
     def validate_rate_limits(cls, v):
         """Validate rate limit values."""
         try:
@@ -82,7 +119,8 @@ class Settings(BaseSettings):
         except (ValueError, TypeError):
             raise ValueError("Rate limit must be a positive integer")
 
-    @validator("SECRET_KEY", pre=True)
+    @field_validator("SECRET_KEY", mode="before")
+    @classmethod
     def validate_secret_key(cls, v):
         """Validate that SECRET_KEY is set."""
         if not v:
@@ -99,12 +137,12 @@ class Settings(BaseSettings):
                 self.POSTGRES_DB}"
         return database_url
 
-    class Config:
-        case_sensitive = True
-        env_file = ".env"
+    @property
+    def ASYNC_SQLALCHEMY_DATABASE_URI(self) -> str:
+        return self.SQLALCHEMY_DATABASE_URI.replace("+psycopg2", "+asyncpg", 1)
 
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
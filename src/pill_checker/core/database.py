@@ -1,16 +1,45 @@
 """Database configuration and session management."""
 
-from typing import Generator
+import time
+from typing import AsyncGenerator, Generator
 
-from sqlalchemy import NullPool, create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from .config import settings
 from .logging_config import logger
 
+# Pooled connections are reused across requests; migrations keep their own NullPool engine.
+# Sizes are set per engine so the sync and async pools share one connection budget.
+POOL_OPTIONS = {
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": True,
+}
+
+
+def _log_slow_queries(target: Engine) -> None:
+    """Log statements that take longer than DB_SLOW_QUERY_MS."""
+    threshold = settings.DB_SLOW_QUERY_MS / 1000
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _check_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        if elapsed > threshold:
+            logger.warning(f"Slow query ({elapsed * 1000:.0f} ms): {statement}")
+
+
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
-    poolclass=NullPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    **POOL_OPTIONS,
 )
 
 # Create session factory
@@ -20,6 +49,24 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# Async engine for code paths that run on the event loop (FastAPI-Users, async endpoints)
+async_engine = create_async_engine(
+    settings.ASYNC_SQLALCHEMY_DATABASE_URI,
+    pool_size=settings.DB_ASYNC_POOL_SIZE,
+    max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+    **POOL_OPTIONS,
+)
+
+if settings.DB_SLOW_QUERY_MS > 0:
+    _log_slow_queries(engine)
+    _log_slow_queries(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 
 def get_db() -> Generator[Session, None, None]:
     """Get a database session."""
@@ -33,3 +80,15 @@ def get_db() -> Generator[Session, None, None]:
         raise
     finally:
         session.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get an async database session."""
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception as e:
+            logger.error(f"Database session error: {e}")
+            await session.rollback()
+            raise
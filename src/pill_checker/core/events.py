@@ -1,13 +1,15 @@
 """Application event handlers and health checks."""
 
+import inspect
 from typing import Callable
 
 from fastapi import FastAPI, Response, status
 from sqlalchemy import text
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from pill_checker.core.database import engine
-from pill_checker.core.logging_config import logger
+from pill_checker.core.config import settings
+from pill_checker.core.database import async_engine, engine
+from pill_checker.core.logging_config import flush_logging, logger
 
 
 def create_start_app_handler(app: FastAPI) -> Callable:
@@ -27,10 +29,33 @@ def create_start_app_handler(app: FastAPI) -> Callable:
             logger.error(f"Database connection failed: {e}")
             raise
 
-    def start_app() -> None:
+    async def _connect_async_pool() -> None:
+        """Open the first async connection so the first authenticated request skips it."""
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        logger.info("Async database pool connected")
+
+    def _init_services() -> None:
+        """Create service singletons up front instead of on first request."""
+        from pill_checker.services.ocr import get_ocr_batcher, get_ocr_client
+        from pill_checker.services.storage import get_storage_service
+
+        ocr_client = get_ocr_client()
+        get_ocr_batcher()
+        get_storage_service()
+        logger.info("Services initialized")
+
+        if settings.OCR_WARMUP:
+            # Run the OCR models once so the first upload does not pay for it
+            ocr_client.warm_up(batch_size=settings.OCR_BATCH_SIZE)
+            logger.info("OCR models warmed up")
+
+    async def start_app() -> None:
         """Initialize application services."""
         try:
             _check_db_connection()
+            await _connect_async_pool()
+            _init_services()
             logger.info("Application startup complete")
         except Exception as e:
             logger.error(f"Application startup failed: {e}")
@@ -42,14 +67,33 @@ def create_start_app_handler(app: FastAPI) -> Callable:
 def create_stop_app_handler(app: FastAPI) -> Callable:
     """Create a handler for application shutdown events."""
 
-    def stop_app() -> None:
-        """Clean up application resources."""
-        try:
-            engine.dispose()
-            logger.info("Database connections closed")
-        except Exception as e:
-            logger.error(f"Error during shutdown: {e}")
-            raise
+    async def stop_app() -> None:
+        """
+        Clean up application resources.
+
+        Each step runs on its own, so one failure neither skips the remaining
+        steps nor the final log flush.
+        """
+        from pill_checker.services.biomed_ner_client import close_ner_client, close_ner_executor
+        from pill_checker.services.ocr import close_ocr_batcher
+
+        steps = [
+            ("database connections", engine.dispose),
+            ("async database connections", async_engine.dispose),
+            ("NER client", close_ner_client),
+            ("NER workers", close_ner_executor),
+            ("OCR batcher", close_ocr_batcher),
+        ]
+        for name, close in steps:
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+                logger.info(f"Closed {name}")
+            except Exception as e:
+                logger.error(f"Error closing {name} during shutdown: {e}")
+
+        flush_logging()
 
     return stop_app
 
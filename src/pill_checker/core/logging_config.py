@@ -1,15 +1,43 @@
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
+from typing import Optional
 
 from .config import settings
 
 
+class _FlushingQueueListener(QueueListener):
+    """Queue listener that flushes buffered handlers whenever the queue runs dry."""
+
+    def dequeue(self, block):
+        """
+        Take the next record, first flushing buffers if none is waiting.
+
+        Records are only held back while more are already queued behind them,
+        so bursts are written in batches and nothing sits in a buffer while
+        the application is idle.
+        """
+        if block and self.queue.empty():
+            _flush_buffers(self.handlers)
+        return self.queue.get(block)
+
+
+# Background thread that owns the real handlers
+_listener: Optional[QueueListener] = None
+
+
 def setup_logging() -> logging.Logger:
     """
     Configure logging for the application.
     Returns a configured logger instance.
+
+    Records are put on a queue and written by a listener thread, so
+    logging calls never block the caller on stdout or file I/O.
     """
+    global _listener
     # Create logs directory if it doesn't exist
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
@@ -41,10 +69,22 @@ def setup_logging() -> logging.Logger:
 
     # Remove existing handlers to avoid duplicates
     logger.handlers.clear()
+    if _listener is not None:
+        _listener.stop()
+
+    # Only the queue handler runs on the caller's thread
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+
+    handlers = [console_handler, file_handler]
+    if settings.LOG_BUFFER_SIZE > 0 and not settings.DEBUG:
+        # Coalesce bursts into fewer writes; warnings and errors flush immediately,
+        # and the listener flushes whenever the queue is empty.
+        # Development keeps unbuffered output so logs show up as they happen.
+        handlers = [_buffered(handler) for handler in handlers]
 
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    _listener = _FlushingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
     # Prevent propagation to root logger
     logger.propagate = False
@@ -52,5 +92,39 @@ def setup_logging() -> logging.Logger:
     return logger
 
 
+def _buffered(handler: logging.Handler) -> MemoryHandler:
+    """Wrap a handler so records are written in batches."""
+    buffered = MemoryHandler(
+        capacity=settings.LOG_BUFFER_SIZE,
+        flushLevel=logging.WARNING,
+        target=handler,
+    )
+    buffered.setLevel(handler.level)
+    return buffered
+
+
+def _flush_buffers(handlers) -> None:
+    """Flush the MemoryHandler buffers among the given handlers."""
+    for handler in handlers:
+        if isinstance(handler, MemoryHandler):
+            handler.flush()
+
+
+def flush_logging() -> None:
+    """Write out any buffered records."""
+    if _listener is not None:
+        _flush_buffers(_listener.handlers)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        flush_logging()
+        _listener = None
+
+
 # Create and export logger instance
 logger = setup_logging()
+atexit.register(stop_logging)
@@ -3,27 +3,46 @@
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.security import OAuth2PasswordBearer
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.types import ASGIApp
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from pill_checker.services.auth_manager import get_token_user_id
 
 from .config import settings
 
-# OAuth2 configuration
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-# Rate limiting configuration
+def rate_limit_key(request: Request) -> str:
+    """
+    Key rate limits on the authenticated user, falling back to the client address.
+
+    Users behind one proxy or NAT get separate buckets. The client address is
+    the real one when the proxy is listed in FORWARDED_ALLOW_IPS.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        user_id = get_token_user_id(token)
+        if user_id is not None:
+            return f"user:{user_id}"
+    return get_remote_address(request)
+
+
+# Rate limiting configuration. Fixed-window counters cost one round trip per
+# limit; on Redis each hit is a single atomic INCR + EXPIRE script.
 limiter = Limiter(
-    key_func=get_remote_address,
+    key_func=rate_limit_key,
     default_limits=[
         f"{settings.RATE_LIMIT_PER_SECOND} per second",
         f"{settings.RATE_LIMIT_PER_MINUTE} per minute",
         f"{settings.RATE_LIMIT_PER_HOUR} per hour",
     ],
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy="fixed-window",
 )
 
 
@@ -89,18 +108,13 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 
 
 def setup_security(app: FastAPI) -> None:
-    """Configure security middleware and CORS."""
+    """
+    Configure security middleware and CORS.
 
-    # CORS configuration
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
-        allow_credentials=True,
-        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-        allow_headers=["*"],
-        expose_headers=["Content-Range", "Range"],
-        max_age=3600,
-    )
+    Middleware added later wraps the earlier ones, so the outermost layers come last:
+    rate limit responses still carry CORS and security headers, and requests for
+    untrusted hosts are rejected before they count against a rate limit.
+    """
 
     # Session middleware
     app.add_middleware(
@@ -112,6 +126,12 @@ def setup_security(app: FastAPI) -> None:
         path="/",  # Cookie path
     )
 
+    # Rate limiting. Routes marked with limiter.exempt and mounted apps such as
+    # /static are not counted.
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+    app.add_middleware(SlowAPIMiddleware)
+
     # Security headers middleware
     app.add_middleware(
         SecurityHeadersMiddleware,
@@ -126,6 +146,17 @@ def setup_security(app: FastAPI) -> None:
             allowed_hosts=[str(host) for host in settings.TRUSTED_HOSTS],
         )
 
-    # Rate limiting
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+    # CORS configuration
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
+        allow_headers=["*"],
+        expose_headers=["Content-Range", "Range"],
+        max_age=3600,
+    )
+
+    # Added last so it runs first: the rate limit key sees the forwarded client address
+    if settings.FORWARDED_ALLOW_IPS:
+        app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=settings.FORWARDED_ALLOW_IPS)
@@ -1,16 +1,27 @@
 from pathlib import Path
 
 from fastapi import FastAPI, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.routing import Mount
 
 from pill_checker.api.v1 import auth
 from pill_checker.api.v1 import medications
 from pill_checker.core.config import settings
 from pill_checker.core.events import setup_events
-from pill_checker.core.security import setup_security
-from pill_checker.services import ocr, session_service, auth as auth_service
+from pill_checker.core.security import limiter, setup_security
+from pill_checker.services import ocr, session_service, auth_manager as auth_service
+
+
+class CachedStaticFiles(StaticFiles):
+    """Static files served with a Cache-Control max-age, so browsers skip revalidation."""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault("Cache-Control", f"public, max-age={settings.STATIC_MAX_AGE}")
+        return response
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -19,13 +30,18 @@ app = FastAPI(
     description="API for PillChecker application",
     docs_url="/api/docs" if settings.DEBUG else None,  # Disable docs in production
     redoc_url="/api/redoc" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure static files and templates
 BASE_DIR = Path(__file__).parent
 static_dir = BASE_DIR / "static"
 templates = Jinja2Templates(directory=BASE_DIR / "templates")
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+if settings.SERVE_STATIC:
+    app.mount("/static", CachedStaticFiles(directory=static_dir), name="static")
+else:
+    # Served by the reverse proxy; the empty mount only lets templates build /static URLs
+    app.router.routes.append(Mount("/static", routes=[], name="static"))
 
 # Configure security and events
 setup_security(app)
@@ -48,14 +64,22 @@ async def home(request: Request):
     return templates.TemplateResponse("base.html", {"request": request, "user": None})
 
 
-@app.get("/favicon.ico")
-async def favicon():
-    """Serve the favicon."""
-    return FileResponse(static_dir / "img/favicon.svg", media_type="image/svg+xml")
+if settings.SERVE_STATIC:
+
+    @app.get("/favicon.ico", include_in_schema=False)
+    @limiter.exempt
+    async def favicon():
+        """Serve the favicon."""
+        return FileResponse(
+            static_dir / "img/favicon.svg",
+            media_type="image/svg+xml",
+            headers={"Cache-Control": f"public, max-age={settings.STATIC_MAX_AGE}"},
+        )
 
 
 # Health check endpoint for Docker
 @app.get("/health")
+@limiter.exempt
 async def health_check():
     """Health check endpoint for monitoring."""
     return {"status": "healthy"}
@@ -1,5 +1,6 @@
 from .base import Base
 from .medication import Medication
+from .ocr_result import OCRResult
 from .profile import Profile
 from .user import User
 
@@ -8,4 +9,5 @@ __all__ = [
     "User",
     "Profile",
     "Medication",
+    "OCRResult",
 ]
@@ -18,6 +18,20 @@ class Base(DeclarativeBase):
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
+    # Column names, computed once per mapped class
+    _column_names: tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        table = cls.__dict__.get("__table__")
+        if table is not None:
+            cls._column_names = tuple(c.name for c in table.columns)
+
     def dict(self) -> dict[str, Any]:
         """Convert model instance to dictionary"""
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        # Loaded values sit in __dict__; only unloaded columns go through the descriptor
+        state = self.__dict__
+        return {
+            name: state[name] if name in state else getattr(self, name)
+            for name in self._column_names
+        }
@@ -11,6 +11,7 @@ from sqlalchemy import (
     Index,
     String,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, relationship
@@ -52,9 +53,12 @@ class Medication(Base):
     title: Mapped[Optional[str]] = Column(
         String(length=255), nullable=True, comment="Name or title of the medication"
     )
+    # Never NULL: keyset pagination compares (scan_date, id) tuples
     scan_date: Mapped[datetime] = Column(
         DateTime,
+        nullable=False,
         default=datetime.utcnow,
+        server_default=text("timezone('utc', now())"),
         comment="Date when the medication was scanned",
     )
     active_ingredients: Mapped[Optional[str]] = Column(
@@ -81,6 +85,13 @@ class Medication(Base):
         Index("idx_medications_profile_id", "profile_id"),  # Add index for profile_id queries
         Index("idx_medications_scan_date", "scan_date"),  # Add index for date-based queries
         Index("idx_medications_title", "title"),  # Add index for title searches
+        # Serves newest-first listings and keyset pagination per profile
+        Index(
+            "idx_medications_profile_scan_date",
+            profile_id,
+            scan_date.desc(),
+            id.desc(),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,34 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import JSON, Column, String, Text
+from sqlalchemy.orm import Mapped
+
+from .base import Base
+
+
+class OCRResult(Base):
+    """
+    Cached OCR and NER output for an uploaded image.
+
+    Attributes:
+        digest: SHA-256 hex digest of the image content
+        ocr_text: Text extracted from the image by OCR
+        entities: Medical entities extracted from the text by NER
+        created_at: Timestamp when the record was created
+        updated_at: Timestamp when the record was last updated
+    """
+
+    __tablename__ = "ocr_results"
+
+    digest: Mapped[str] = Column(
+        String(length=64), primary_key=True, comment="SHA-256 hex digest of the image content"
+    )
+    ocr_text: Mapped[str] = Column(
+        Text, nullable=False, comment="Text extracted from the image by OCR"
+    )
+    entities: Mapped[Optional[List[Dict[str, Any]]]] = Column(
+        JSON, nullable=True, comment="Medical entities extracted from the text by NER"
+    )
+
+    def __repr__(self) -> str:
+        return f"<OCRResult digest={self.digest[:12]}>"
@@ -58,11 +58,21 @@ class MedicationResponse(MedicationInDB):
     scan_url: Optional[str] = Field(None, description="URL of the uploaded medication scan")
 
 
+class PageCursor(BaseSchema):
+    """Schema for a keyset pagination cursor."""
+
+    after_scan_date: datetime = Field(..., description="Scan date of the last item seen")
+    after_id: int = Field(..., description="ID of the last item seen")
+
+
 class PaginatedResponse(BaseSchema):
     """Schema for paginated response."""
 
     items: List[MedicationResponse]
     total: int = Field(..., description="Total number of items")
-    page: int = Field(..., description="Current page number")
+    page: Optional[int] = Field(..., description="Current page number; null when paging by cursor")
     size: int = Field(..., description="Items per page")
     pages: int = Field(..., description="Total number of pages")
+    next_cursor: Optional[PageCursor] = Field(
+        None, description="Query parameters for the next page, if there may be one"
+    )
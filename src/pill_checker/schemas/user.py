@@ -4,7 +4,7 @@ import uuid
 from typing import Optional
 
 from fastapi_users import schemas
-from pydantic import EmailStr
+from pydantic import EmailStr, Field
 
 
 class UserRead(schemas.BaseUser[uuid.UUID]):
@@ -18,7 +18,8 @@ class UserCreate(schemas.BaseUserCreate):
 
     email: EmailStr
     password: str
-    username: Optional[str] = None
+    # Mirrors the profiles.username_length check constraint
+    username: Optional[str] = Field(default=None, min_length=3)
 
 
 class UserUpdate(schemas.BaseUserUpdate):
@@ -6,6 +6,11 @@ import argparse
 import os
 from datetime import datetime
 
+# Allowed characters only, with at least one letter and one number
+PASSWORD_PATTERN = re.compile(
+    r"^[A-Za-z0-9@$!%*#?&]*[A-Za-z][A-Za-z0-9@$!%*#?&]*[0-9][A-Za-z0-9@$!%*#?&]*$|^[A-Za-z0-9@$!%*#?&]*[0-9][A-Za-z0-9@$!%*#?&]*[A-Za-z][A-Za-z0-9@$!%*#?&]*$"
+)
+
 
 def generate_username(min_length=3, max_length=50):
     """Generate a random username between min_length and max_length characters."""
@@ -16,7 +21,7 @@ def generate_username(min_length=3, max_length=50):
 
     # Add remaining characters (letters, numbers, underscores)
     chars = string.ascii_letters + string.digits + "_"
-    username += "".join(random.choice(chars) for _ in range(length - 1))
+    username += "".join(random.choices(chars, k=length - 1))
 
     return username
 
@@ -26,7 +31,7 @@ def generate_password(min_length=8, max_length=72):
     Generate a password that meets the following criteria:
     - Between min_length and max_length characters
     - Contains at least one letter and one number
-    - Matches the regex pattern
+    - Matches PASSWORD_PATTERN
     """
     # Define character sets
     letters = string.ascii_letters
@@ -52,21 +57,13 @@ def generate_password(min_length=8, max_length=72):
         ]
 
     # Add remaining random characters
-    password_list.extend(random.choice(all_chars) for _ in range(length - 2))
+    password_list.extend(random.choices(all_chars, k=length - 2))
 
     # Shuffle the password characters
     random.shuffle(password_list)
 
-    password = "".join(password_list)
-
-    # Verify the password matches the required pattern
-    pattern = r"^[A-Za-z0-9@$!%*#?&]*[A-Za-z][A-Za-z0-9@$!%*#?&]*[0-9][A-Za-z0-9@$!%*#?&]*$|^[A-Za-z0-9@$!%*#?&]*[0-9][A-Za-z0-9@$!%*#?&]*[A-Za-z][A-Za-z0-9@$!%*#?&]*$"
-
-    # If the password doesn't match the pattern, generate a new one
-    if not re.match(pattern, password):
-        return generate_password(min_length, max_length)
-
-    return password
+    # The guaranteed letter and number above always satisfy PASSWORD_PATTERN
+    return "".join(password_list)
 
 
 def generate_email(username=None):
@@ -93,13 +90,12 @@ def validate_password(password):
     """Validate that a password meets all requirements."""
     min_length = 8
     max_length = 72
-    pattern = r"^[A-Za-z0-9@$!%*#?&]*[A-Za-z][A-Za-z0-9@$!%*#?&]*[0-9][A-Za-z0-9@$!%*#?&]*$|^[A-Za-z0-9@$!%*#?&]*[0-9][A-Za-z0-9@$!%*#?&]*[A-Za-z][A-Za-z0-9@$!%*#?&]*$"
 
     validations = {
         "length": min_length <= len(password) <= max_length,
         "has_letter": any(c.isalpha() for c in password),
         "has_number": any(c.isdigit() for c in password),
-        "matches_pattern": bool(re.match(pattern, password)),
+        "matches_pattern": bool(PASSWORD_PATTERN.match(password)),
     }
 
     return validations
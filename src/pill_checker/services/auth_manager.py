@@ -1,20 +1,30 @@
 """Authentication manager using FastAPI-Users."""
 
+import hashlib
+import time
 import uuid
-from typing import Optional
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
-from fastapi import Depends, Request
-from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin
+import jwt
+from fastapi import Depends, HTTPException, Request, status
+from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin, exceptions
 from fastapi_users.authentication import (
     AuthenticationBackend,
     BearerTransport,
     JWTStrategy,
 )
 from fastapi_users.db import SQLAlchemyUserDatabase
+from fastapi_users.jwt import decode_jwt
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from pill_checker.core.config import settings
+from pill_checker.core.database import get_async_db
 from pill_checker.core.logging_config import logger
+from pill_checker.models.profile import Profile
 from pill_checker.models.user import User
+from pill_checker.schemas.user import UserCreate
 
 
 class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
@@ -23,6 +33,25 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
     reset_password_token_secret = settings.SECRET_KEY
     verification_token_secret = settings.SECRET_KEY
 
+    async def create(
+        self, user_create: UserCreate, safe: bool = False, request: Optional[Request] = None
+    ) -> User:
+        """
+        Create a user and its profile.
+
+        The stock register route only maps FastAPI-Users exceptions to 400, so a
+        constraint violation (a taken username, or an email registered
+        concurrently) is raised as an HTTPException here instead of a 500.
+        """
+        try:
+            return await super().create(user_create, safe, request)
+        except IntegrityError as e:
+            logger.warning(f"Registration rejected by a database constraint: {e.orig}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A user with this email or username already exists",
+            ) from e
+
     async def on_after_register(self, user: User, request: Optional[Request] = None):
         """Hook called after user registration."""
         logger.info(f"User {user.id} has registered with email {user.email}")
@@ -40,18 +69,37 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
         logger.info(f"User {user.id} has requested email verification. Token: {token}")
 
 
-async def get_user_db(db=None):
+class UserDatabase(SQLAlchemyUserDatabase[User, uuid.UUID]):
+    """User database adapter that creates the user's profile alongside the user."""
+
+    async def create(self, create_dict: Dict[str, Any]) -> User:
+        """
+        Insert the user and its profile in a single transaction.
+
+        Without an explicit username the profile's stays NULL; deriving one from
+        the email could collide with another user's and fail the registration.
+        """
+        username = create_dict.pop("username", None)
+        user = self.user_table(**create_dict)
+        user.profile = Profile(username=username)
+
+        self.session.add(user)
+        try:
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            raise
+        await self.session.refresh(user)
+        return user
+
+
+async def get_user_db(db: AsyncSession = Depends(get_async_db)):
     """
     Get user database adapter.
-    Note: This is imported from dependencies.py in actual usage.
-    """
-    if db is None:
-        from pill_checker.api.v1.dependencies import get_db
 
-        for session in get_db():
-            yield SQLAlchemyUserDatabase(session, User)
-    else:
-        yield SQLAlchemyUserDatabase(db, User)
+    FastAPI-Users awaits every query, so the adapter needs an async session.
+    """
+    yield UserDatabase(db, User)
 
 
 async def get_user_manager(user_db: SQLAlchemyUserDatabase = Depends(get_user_db)):
@@ -59,12 +107,86 @@ async def get_user_manager(user_db: SQLAlchemyUserDatabase = Depends(get_user_db
     yield UserManager(user_db)
 
 
+# Token digest -> (user id, expiry timestamp) for recently verified JWTs
+_verified_tokens: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+
+
+class CachedJWTStrategy(JWTStrategy):
+    """JWT strategy that skips signature verification for recently seen tokens."""
+
+    def _decode_user_id(self, token: str) -> Optional[str]:
+        """
+        Verify a token and return its subject, using the process-wide cache.
+
+        Entries expire after TOKEN_CACHE_TTL_SECONDS or when the token itself
+        expires, whichever comes first. Tokens are keyed by digest so the cache
+        does not hold raw credentials.
+
+        Raises:
+            jwt.PyJWTError: If the token is invalid
+        """
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        now = time.time()
+
+        cached = _verified_tokens.get(key)
+        if cached is not None:
+            user_id, expires_at = cached
+            if expires_at > now:
+                _verified_tokens.move_to_end(key)
+                return user_id
+            del _verified_tokens[key]
+
+        data = decode_jwt(token, self.decode_key, self.token_audience, algorithms=[self.algorithm])
+        user_id = data.get("sub")
+        if user_id is None:
+            return None
+
+        expires_at = now + settings.TOKEN_CACHE_TTL_SECONDS
+        if "exp" in data:
+            expires_at = min(expires_at, data["exp"])
+        _verified_tokens[key] = (user_id, expires_at)
+        if len(_verified_tokens) > settings.TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+        return user_id
+
+    async def read_token(
+        self, token: Optional[str], user_manager: BaseUserManager[User, uuid.UUID]
+    ) -> Optional[User]:
+        """Resolve the user for a token."""
+        if token is None:
+            return None
+
+        try:
+            user_id = self._decode_user_id(token)
+        except jwt.PyJWTError:
+            return None
+        if user_id is None:
+            return None
+
+        try:
+            return await user_manager.get(user_manager.parse_id(user_id))
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+
+# Secret and lifetime are fixed for the life of the process, so one strategy serves every request
+_jwt_strategy = CachedJWTStrategy(
+    secret=settings.SECRET_KEY,
+    lifetime_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
 def get_jwt_strategy() -> JWTStrategy:
     """Get JWT authentication strategy."""
-    return JWTStrategy(
-        secret=settings.SECRET_KEY,
-        lifetime_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-    )
+    return _jwt_strategy
+
+
+def get_token_user_id(token: str) -> Optional[str]:
+    """Return the user id a valid token was issued for, or None; verification is cached."""
+    try:
+        return _jwt_strategy._decode_user_id(token)
+    except jwt.PyJWTError:
+        return None
 
 
 # Bearer transport for JWT tokens
@@ -1,11 +1,19 @@
 """BiomedNER client for medical entity extraction."""
 
+import copy
+import hashlib
 import os
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from pill_checker.core.config import settings
 from pill_checker.core.logging_config import logger
 
 
@@ -28,17 +36,31 @@ class MedicalNERClient:
             scheme = os.getenv("BIOMED_SCHEME", "http")
             self.api_url = f"{scheme}://{host}"
 
+        self._endpoint = f"{self.api_url}/extract_entities"
+
+        # Keep-alive pool shared by the NER worker threads; retries are left to tenacity
+        self._session = requests.Session()
+        self._session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=max(settings.NER_WORKERS, 1), max_retries=0
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        # Entities by text digest, with expiry times; shared by the NER worker threads
+        self._cache: "OrderedDict[bytes, Tuple[List[Dict[str, Any]], float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
         logger.info(f"Initialized MedicalNERClient with API URL: {self.api_url}")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        reraise=True,
-    )
     def extract_entities(self, text: str, timeout: int = 30) -> List[Dict[str, Any]]:
         """
         Send text to the BiomedNER API and retrieve recognized entities.
 
+        Results are cached per text for NER_CACHE_TTL_SECONDS, so repeated
+        labels skip the API call. Cached entity dicts are shared between
+        callers and must not be mutated.
+
         Args:
             text: Input text to extract medical entities from
             timeout: Request timeout in seconds
@@ -66,14 +88,45 @@ class MedicalNERClient:
             logger.warning("Empty text provided to extract_entities")
             return []
 
+        if settings.NER_CACHE_SIZE <= 0:
+            return self._fetch_entities(text, timeout)
+
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                entities, expires_at = cached
+                if expires_at > now:
+                    self._cache.move_to_end(key)
+                    # Entities hold nested lists and dicts; callers get their own copy
+                    return copy.deepcopy(entities)
+                del self._cache[key]
+
+        entities = self._fetch_entities(text, timeout)
+
+        with self._cache_lock:
+            self._cache[key] = (copy.deepcopy(entities), now + settings.NER_CACHE_TTL_SECONDS)
+            self._cache.move_to_end(key)
+            if len(self._cache) > settings.NER_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return entities
+
+    def clear_cache(self) -> None:
+        """Forget all cached extraction results."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        reraise=True,
+    )
+    def _fetch_entities(self, text: str, timeout: int) -> List[Dict[str, Any]]:
+        """Call the BiomedNER API, retrying transient failures."""
         try:
             logger.debug(f"Sending text to BiomedNER API: {text[:100]}...")
-            response = requests.post(
-                f"{self.api_url}/extract_entities",
-                json={"text": text},
-                timeout=timeout,
-                headers={"Content-Type": "application/json"},
-            )
+            response = self._session.post(self._endpoint, json={"text": text}, timeout=timeout)
 
             if response.status_code != 200:
                 error_msg = (
@@ -99,6 +152,10 @@ class MedicalNERClient:
             logger.error(f"Unexpected error in extract_entities: {e}")
             raise
 
+    def close(self) -> None:
+        """Close pooled connections to the BiomedNER API."""
+        self._session.close()
+
     def find_active_ingredients(self, text: str) -> List[str]:
         """
         Extract canonical names of medical entities (for backward compatibility).
@@ -107,10 +164,10 @@ class MedicalNERClient:
             text: Input text to extract active ingredients from
 
         Returns:
-            List of canonical ingredient names
+            List of unique canonical ingredient names, in order of first mention
         """
         entities = self.extract_entities(text)
-        ingredients = []
+        ingredients: Dict[str, str] = {}
 
         for entity in entities:
             umls_entities = entity.get("umls_entities", [])
@@ -118,9 +175,9 @@ class MedicalNERClient:
                 # Get canonical name from first UMLS entity
                 canonical_name = umls_entities[0].get("canonical_name")
                 if canonical_name:
-                    ingredients.append(canonical_name)
+                    ingredients.setdefault(canonical_name.lower(), canonical_name)
 
-        return ingredients
+        return list(ingredients.values())
 
     def get_entity_details(self, text: str) -> List[Dict[str, Any]]:
         """
@@ -135,8 +192,9 @@ class MedicalNERClient:
         return self.extract_entities(text)
 
 
-# Singleton instance
+# Singleton instances
 _ner_client: Optional[MedicalNERClient] = None
+_ner_executor: Optional[ThreadPoolExecutor] = None
 
 
 def get_ner_client(api_url: Optional[str] = None) -> MedicalNERClient:
@@ -151,5 +209,41 @@ def get_ner_client(api_url: Optional[str] = None) -> MedicalNERClient:
     """
     global _ner_client
     if _ner_client is None or api_url:
+        if _ner_client is not None:
+            _ner_client.close()
         _ner_client = MedicalNERClient(api_url=api_url)
     return _ner_client
+
+
+def close_ner_client() -> None:
+    """Close the MedicalNER client singleton, if one was created."""
+    global _ner_client
+    if _ner_client is not None:
+        _ner_client.close()
+        _ner_client = None
+
+
+def get_ner_executor() -> ThreadPoolExecutor:
+    """
+    Get the worker pool for blocking NER calls.
+
+    Kept separate from the OCR worker so NER for one upload can run
+    while OCR for the next one is in progress.
+
+    Returns:
+        ThreadPoolExecutor for NER requests
+    """
+    global _ner_executor
+    if _ner_executor is None:
+        _ner_executor = ThreadPoolExecutor(
+            max_workers=settings.NER_WORKERS, thread_name_prefix="ner"
+        )
+    return _ner_executor
+
+
+def close_ner_executor() -> None:
+    """Shut down the NER worker pool, waiting for running calls to finish."""
+    global _ner_executor
+    if _ner_executor is not None:
+        _ner_executor.shutdown(wait=True)
+        _ner_executor = None
@@ -3,6 +3,47 @@
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
+# Patterns are compiled once at import. Each list is in priority order: the
+# first pattern that matches anywhere in the text wins, even if a later pattern
+# matches earlier in the text (e.g. "1% cream 30 g" -> "30 g").
+
+# Common dosage patterns
+_DOSAGE_PATTERNS = [
+    # 500/125mg; tried first so it is not cut down to its "125mg" suffix
+    re.compile(r"(\d+(?:\.\d+)?\s*/\s*\d+(?:\.\d+)?\s*(?:mg|ml))", re.IGNORECASE),
+    # 200mg, 0.5ml, 100mcg
+    re.compile(r"(\d+(?:\.\d+)?\s*(?:mg|g|ml|mcg|µg|iu|units?))", re.IGNORECASE),
+    # 5% concentration
+    re.compile(r"(\d+(?:\.\d+)?%)", re.IGNORECASE),
+]
+
+# Capitalized words that might be a drug name, like "Ibuprofen" or "Amoxicillin"
+_TITLE_FALLBACK = re.compile(r"\b[A-Z][a-z]{2,}(?:il|in|ine|ol|one|ide)?\b")
+
+# Frequency/instructions: "every 4 hours", then "twice a day", then "2 times a day"
+_FREQUENCY_PATTERNS = [
+    re.compile(r"(every\s+\d+\s+hours?)", re.IGNORECASE),
+    re.compile(r"(once|twice|three times)\s*(?:per|a)?\s*day", re.IGNORECASE),
+    re.compile(r"(\d+\s*times?\s*(?:per|a|daily|day))", re.IGNORECASE),
+]
+
+_TIMING_RE = re.compile(r"(morning|evening|bedtime|night)", re.IGNORECASE)
+
+# Expiry: full dates, then year-month / month-year
+_EXPIRY_PATTERNS = [
+    re.compile(r"(?:exp|expiry|expires?)[:\s]+(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})", re.IGNORECASE),
+    re.compile(r"(?:exp|expiry|expires?)[:\s]+(\d{2,4}[-/]\d{1,2})", re.IGNORECASE),
+]
+
+
+def _search_first(patterns: List[re.Pattern], text: str) -> Optional[str]:
+    """Return the first group of the first pattern that matches the text."""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match.group(1).strip()
+    return None
+
 
 def extract_dosage(text: str) -> Optional[str]:
     """
@@ -18,22 +59,78 @@ def extract_dosage(text: str) -> Optional[str]:
         "Take 200mg daily" -> "200mg"
         "Ibuprofen 500 mg tablets" -> "500 mg"
         "0.5ml twice daily" -> "0.5ml"
+        "Amoxiclav 500/125mg" -> "500/125mg"
     """
-    # Common dosage patterns
-    patterns = [
-        r"(\d+(?:\.\d+)?\s*(?:mg|g|ml|mcg|µg|iu|units?))",  # 200mg, 0.5ml, 100mcg
-        r"(\d+(?:\.\d+)?\s*/\s*\d+(?:\.\d+)?\s*(?:mg|ml))",  # 500/125mg
-        r"(\d+(?:\.\d+)?%)",  # 5% concentration
-    ]
+    return _search_first(_DOSAGE_PATTERNS, text)
 
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
+
+def _canonical_names(entities: List[Dict[str, Any]]) -> List[str]:
+    """Collect the canonical name of each entity's first UMLS match, in order."""
+    names = []
+    for entity in entities:
+        umls_entities = entity.get("umls_entities", [])
+        if umls_entities:
+            canonical = umls_entities[0].get("canonical_name")
+            if canonical:
+                names.append(canonical)
+    return names
+
+
+def _title_from(
+    text: str, names: List[str], dosage: Optional[str], max_length: int
+) -> Optional[str]:
+    """Build a title from pre-extracted canonical names and dosage."""
+    # Prefer the first canonical name, with dosage if available
+    if names:
+        title = f"{names[0]} {dosage}" if dosage else names[0]
+        return title[:max_length]
+
+    # Fallback: extract first capitalized word(s) that might be a drug name
+    match = _TITLE_FALLBACK.search(text)
+    if match:
+        return match.group(0)[:max_length]
+
+    # Last resort: use first few words
+    words = text.split()
+    if words:
+        return " ".join(words[:3])[:max_length]
 
     return None
 
 
+def _ingredients_from(names: List[str]) -> str:
+    """Join canonical names, case-insensitively deduplicated, keeping first spelling and order."""
+    unique_chemicals: Dict[str, str] = {}
+    for name in names:
+        unique_chemicals.setdefault(name.lower(), name)
+    return ", ".join(unique_chemicals.values())
+
+
+def _details_from(text: str, names: List[str]) -> Dict[str, Any]:
+    """Build prescription details from the text and pre-extracted canonical names."""
+    details: Dict[str, Any] = {}
+
+    # Extract frequency/instructions
+    frequency = _search_first(_FREQUENCY_PATTERNS, text)
+    if frequency:
+        details["frequency"] = frequency
+
+    match = _TIMING_RE.search(text)
+    if match:
+        details["timing"] = match.group(1).strip()
+
+    # Extract expiry date
+    expiry_date = _search_first(_EXPIRY_PATTERNS, text)
+    if expiry_date:
+        details["expiry_date"] = expiry_date
+
+    # Add entity metadata
+    if names:
+        details["detected_entities"] = names
+
+    return details
+
+
 def extract_title(
     text: str, entities: List[Dict[str, Any]], max_length: int = 200
 ) -> Optional[str]:
@@ -50,33 +147,9 @@ def extract_title(
     Returns:
         Medication title/name
     """
-    # Try to get canonical name from first entity with UMLS data
-    if entities:
-        for entity in entities:
-            umls_entities = entity.get("umls_entities", [])
-            if umls_entities:
-                canonical = umls_entities[0].get("canonical_name")
-                if canonical:
-                    # Add dosage if available
-                    dosage = extract_dosage(text)
-                    if dosage:
-                        title = f"{canonical} {dosage}"
-                    else:
-                        title = canonical
-                    return title[:max_length]
-
-    # Fallback: extract first capitalized word(s) that might be a drug name
-    # Look for patterns like "Ibuprofen" or "Amoxicillin"
-    match = re.search(r"\b[A-Z][a-z]{2,}(?:il|in|ine|ol|one|ide)?\b", text)
-    if match:
-        return match.group(0)[:max_length]
-
-    # Last resort: use first few words
-    words = text.split()
-    if words:
-        return " ".join(words[:3])[:max_length]
-
-    return None
+    names = _canonical_names(entities)
+    dosage = extract_dosage(text) if names else None
+    return _title_from(text, names, dosage, max_length)
 
 
 def format_active_ingredients(entities: List[Dict[str, Any]]) -> str:
@@ -89,25 +162,7 @@ def format_active_ingredients(entities: List[Dict[str, Any]]) -> str:
     Returns:
         Comma-separated string of unique active ingredients
     """
-    chemicals = []
-
-    for entity in entities:
-        umls_entities = entity.get("umls_entities", [])
-        if umls_entities:
-            # Get canonical name from first UMLS entity
-            canonical = umls_entities[0].get("canonical_name")
-            if canonical:
-                chemicals.append(canonical)
-
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_chemicals = []
-    for chem in chemicals:
-        if chem and chem.lower() not in seen:
-            seen.add(chem.lower())
-            unique_chemicals.append(chem)
-
-    return ", ".join(unique_chemicals) if unique_chemicals else ""
+    return _ingredients_from(_canonical_names(entities))
 
 
 def extract_prescription_details(
@@ -123,46 +178,7 @@ def extract_prescription_details(
     Returns:
         Dictionary with prescription metadata
     """
-    details: Dict[str, Any] = {}
-
-    # Extract frequency/instructions
-    frequency_patterns = [
-        (r"(\d+\s*times?\s*(?:per|a|daily|day))", "frequency"),
-        (r"(once|twice|three times)\s*(?:per|a)?\s*day", "frequency"),
-        (r"(every\s+\d+\s+hours?)", "frequency"),
-        (r"(morning|evening|bedtime|night)", "timing"),
-    ]
-
-    for pattern, key in frequency_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            details[key] = match.group(1).strip()
-
-    # Extract expiry date
-    expiry_patterns = [
-        r"(?:exp|expiry|expires?)[:\s]+(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})",
-        r"(?:exp|expiry|expires?)[:\s]+(\d{2,4}[-/]\d{1,2})",
-    ]
-
-    for pattern in expiry_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            details["expiry_date"] = match.group(1).strip()
-            break
-
-    # Add entity metadata
-    entity_names = []
-    for entity in entities:
-        umls_entities = entity.get("umls_entities", [])
-        if umls_entities:
-            canonical = umls_entities[0].get("canonical_name")
-            if canonical:
-                entity_names.append(canonical)
-
-    if entity_names:
-        details["detected_entities"] = entity_names
-
-    return details
+    return _details_from(text, _canonical_names(entities))
 
 
 def process_medication_text(
@@ -171,6 +187,9 @@ def process_medication_text(
     """
     Process OCR text and NER entities into structured medication data.
 
+    Entities are walked and the dosage is extracted once, then shared by the
+    title, ingredients and details.
+
     Args:
         ocr_text: Raw text from OCR
         entities: Entity list from BiomedNER
@@ -178,9 +197,11 @@ def process_medication_text(
     Returns:
         Tuple of (title, active_ingredients, dosage, prescription_details)
     """
-    title = extract_title(ocr_text, entities)
-    active_ingredients = format_active_ingredients(entities)
+    names = _canonical_names(entities)
     dosage = extract_dosage(ocr_text)
-    prescription_details = extract_prescription_details(ocr_text, entities)
+
+    title = _title_from(ocr_text, names, dosage, max_length=200)
+    active_ingredients = _ingredients_from(names)
+    prescription_details = _details_from(ocr_text, names)
 
     return title, active_ingredients, dosage, prescription_details
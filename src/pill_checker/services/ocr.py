@@ -1,24 +1,76 @@
 """OCR service for text recognition from images."""
 
+import asyncio
+import contextlib
 import io
-from typing import BinaryIO, Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import BinaryIO, List, Optional, Sequence, Union
 
+import numpy as np
 from PIL import Image, ImageEnhance, ImageFilter
 
+from pill_checker.core.config import settings
+from pill_checker.core.logging_config import logger
+
 
 class EasyOCRClient:
     """OCR client using EasyOCR."""
 
-    def __init__(self, languages=None):
-        """Initialize EasyOCR reader immediately on startup."""
+    # Canvas of the blank warm-up batch
+    BATCH_WIDTH = 800
+    BATCH_HEIGHT = 600
+
+    # Fill for padding batched images; thresholded pages have a white background
+    PAD_VALUE = 255
+
+    # Large JPEGs are decoded at reduced scale, never below this size
+    DECODE_SIZE = (1600, 1200)
+
+    fp16 = False
+
+    def __init__(self, languages=None, gpu: bool = True, quantize: bool = True, fp16: bool = True):
+        """
+        Initialize EasyOCR reader immediately on startup.
+
+        Args:
+            languages: Languages to recognize
+            gpu: Use CUDA when available
+            quantize: Apply dynamic INT8 quantization to the models on CPU
+            fp16: Run inference in half precision on CUDA
+        """
         self.languages = languages or ["en"]
         import easyocr
 
-        self.reader = easyocr.Reader(self.languages)
+        self.reader = easyocr.Reader(
+            self.languages, gpu=gpu, quantize=quantize, cudnn_benchmark=True
+        )
+        self.fp16 = fp16 and self.reader.device == "cuda"
         print("EasyOCR initialized and ready")
 
+    def inference_context(self):
+        """Return the autocast context for model inference."""
+        if self.fp16:
+            import torch
+
+            return torch.autocast("cuda", dtype=torch.float16)
+        return contextlib.nullcontext()
+
+    def warm_up(self, batch_size: int = 16) -> None:
+        """
+        Run a blank batch through the models.
+
+        The first inference pays for cuDNN autotuning and lazy weight
+        initialization; doing it here keeps that cost off the first request.
+        """
+        blank = np.zeros([batch_size, self.BATCH_HEIGHT, self.BATCH_WIDTH, 3], np.uint8)
+        with self.inference_context():
+            self.reader.readtext_batched(blank, batch_size=batch_size, detail=0)
+
     def preprocess_grayscale(self, image: Image.Image) -> Image.Image:
         """Convert image to grayscale."""
+        if image.mode == "L":
+            return image
         return image.convert("L")
 
     def preprocess_contrast(self, image: Image.Image, factor: float = 1.5) -> Image.Image:
@@ -37,7 +89,7 @@ class EasyOCRClient:
 
     def preprocess_threshold(self, image: Image.Image, threshold: int = 128) -> Image.Image:
         """Convert image to binary using threshold."""
-        grayscale = image.convert("L")
+        grayscale = image if image.mode == "L" else image.convert("L")
         return grayscale.point(lambda p: 255 if p > threshold else 0)
 
     def preprocess_resize(self, image: Image.Image, scale_factor: float = 2.0) -> Image.Image:
@@ -52,7 +104,7 @@ class EasyOCRClient:
         return image.crop((border, border, width - border, height - border))
 
     def preprocess_image(self, image: Image.Image) -> Image.Image:
-        """Chain all pre-processing steps and convert to RGB at the end."""
+        """Chain all pre-processing steps, producing a single-channel image."""
         image = self.preprocess_grayscale(image)
         image = self.preprocess_contrast(image)
         image = self.preprocess_sharpness(image)
@@ -60,38 +112,246 @@ class EasyOCRClient:
         image = self.preprocess_threshold(image)
         image = self.preprocess_resize(image)
         image = self.preprocess_crop(image)
-        return image.convert("RGB")
+        # EasyOCR accepts grayscale arrays, so no RGB expansion is needed
+        return image
 
-    def read_text(self, image_data: Union[bytes, BinaryIO]) -> str:
-        """Extract text using EasyOCR."""
-        # Load image from bytes or file-like object
+    def load_image(self, image_data: Union[bytes, BinaryIO]) -> Image.Image:
+        """Load image from bytes or file-like object."""
         if isinstance(image_data, bytes):
             image = Image.open(io.BytesIO(image_data))
         else:
             image = Image.open(image_data)
 
-        # Preprocess image using the defined chain
-        image = self.preprocess_image(image)
-
-        # Convert preprocessed image to bytes for EasyOCR
-        image_bytes = io.BytesIO()
-        image.save(image_bytes, format="JPEG")
-        image_bytes.seek(0)
+        # Let libjpeg decode straight to grayscale, downscaled when the photo is large.
+        # No-op for formats other than JPEG.
+        image.draft("L", self.DECODE_SIZE)
+        return image
 
-        # Extract text
-        results = self.reader.readtext(image_bytes.read(), detail=0)
+    def read_text(self, image_data: Union[bytes, BinaryIO]) -> str:
+        """Extract text using EasyOCR."""
+        # Hand pixels to EasyOCR directly; re-encoding would only be decoded again
+        array = self.prepare_image(image_data)
+        with self.inference_context():
+            results = self.reader.readtext(array, detail=0)
         return " ".join(results)
 
+    def prepare_image(self, image_data: Union[bytes, BinaryIO]) -> np.ndarray:
+        """Decode and preprocess an image into the array handed to EasyOCR."""
+        return np.asarray(self.preprocess_image(self.load_image(image_data)))
+
+    def pad_to_canvas(self, arrays: Sequence[np.ndarray]) -> List[np.ndarray]:
+        """
+        Pad images to the batch's largest height and width.
+
+        readtext_batched needs equal-sized inputs. Padding the bottom and right
+        edges keeps every image at its own scale and aspect ratio, where
+        resizing to a fixed canvas would stretch them.
+        """
+        height = max(array.shape[0] for array in arrays)
+        width = max(array.shape[1] for array in arrays)
+        padded = []
+        for array in arrays:
+            pad = [(0, height - array.shape[0]), (0, width - array.shape[1])]
+            pad += [(0, 0)] * (array.ndim - 2)
+            padded.append(np.pad(array, pad, constant_values=self.PAD_VALUE))
+        return padded
+
+    def read_text_batch(
+        self,
+        images: Sequence[Union[bytes, BinaryIO]],
+        batch_size: int = 16,
+        return_exceptions: bool = False,
+    ) -> List[Union[str, Exception]]:
+        """
+        Extract text from several images with a single batched EasyOCR call.
+
+        Args:
+            images: Images as bytes or file-like objects
+            batch_size: Recognizer batch size passed to EasyOCR
+            return_exceptions: Return an image's decoding error in its slot
+                instead of raising, so the other images are still read
+
+        Returns:
+            Extracted text (or the error, see return_exceptions) for each image,
+            in input order
+        """
+        results: List[Union[str, Exception, None]] = [None] * len(images)
+        arrays = []
+        for index, image_data in enumerate(images):
+            try:
+                arrays.append((index, self.prepare_image(image_data)))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[index] = e
+
+        if arrays:
+            with self.inference_context():
+                texts = self.reader.readtext_batched(
+                    self.pad_to_canvas([array for _, array in arrays]),
+                    batch_size=batch_size,
+                    detail=0,
+                )
+            for (index, _), text in zip(arrays, texts):
+                results[index] = " ".join(text)
+        return results
+
+
+class OCRBatcher:
+    """Coalesce concurrent OCR requests into batched EasyOCR calls."""
+
+    def __init__(
+        self,
+        client: EasyOCRClient,
+        max_batch_size: int = 16,
+        max_wait_ms: int = 30,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            client: OCR client used to run batches
+            max_batch_size: Maximum number of images per batch
+            max_wait_ms: How long to wait for a batch to fill up
+        """
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Dedicated worker so OCR batches never queue behind NER calls
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr")
+
+    def close(self) -> None:
+        """
+        Stop the batching worker and shut down the OCR thread.
+
+        Waits for a batch that is already running to finish.
+        """
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+        self._worker = None
+        self._executor.shutdown(wait=True)
+
+    def _ensure_worker(self) -> None:
+        """Start the batching worker on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker is not None and not self._worker.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._worker = loop.create_task(self._run())
+
+    async def read_text(self, image_data: Union[bytes, BinaryIO]) -> str:
+        """Queue an image for OCR and wait for its text."""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((image_data, future))
+        return await future
+
+    async def _collect(self) -> list:
+        """
+        Wait for one item, then gather more until the batch is full or time is up.
+
+        A request that arrives to an empty queue is returned right away, so light
+        traffic never waits for a batch window. Requests that queue up while OCR
+        is running are picked up together on the next pass.
+        """
+        batch = [await self._queue.get()]
+        if self._queue.empty():
+            return batch
+
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        """Process queued images in batches."""
+        while True:
+            batch = await self._collect()
+            images = [image_data for image_data, _ in batch]
+
+            try:
+                if len(images) == 1:
+                    # Single images skip padding to the shared batch canvas
+                    texts = [
+                        await self._loop.run_in_executor(
+                            self._executor, self.client.read_text, images[0]
+                        )
+                    ]
+                else:
+                    # Undecodable images come back as errors for their own request only
+                    texts = await self._loop.run_in_executor(
+                        self._executor,
+                        partial(
+                            self.client.read_text_batch,
+                            images,
+                            self.max_batch_size,
+                            return_exceptions=True,
+                        ),
+                    )
+                if len(texts) != len(batch):
+                    raise RuntimeError(f"Expected {len(batch)} OCR results, got {len(texts)}")
+            except Exception as e:
+                logger.error(f"Batched OCR failed for {len(batch)} images: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            logger.debug(f"Processed OCR batch of {len(batch)} images")
+            for (_, future), text in zip(batch, texts):
+                if future.done():
+                    continue
+                if isinstance(text, Exception):
+                    logger.error(f"OCR failed for one image in a batch of {len(batch)}: {text}")
+                    future.set_exception(text)
+                else:
+                    future.set_result(text)
+
 
 _ocr_client = None
+_ocr_batcher = None
 
 
 def get_ocr_client(languages=None):
     """Get or create the OCR client singleton."""
     global _ocr_client
     if _ocr_client is None:
-        _ocr_client = EasyOCRClient(languages=languages)
+        _ocr_client = EasyOCRClient(
+            languages=languages,
+            gpu=settings.OCR_GPU,
+            quantize=settings.OCR_QUANTIZE,
+            fp16=settings.OCR_FP16,
+        )
     return _ocr_client
 
 
-get_ocr_client()
+def get_ocr_batcher() -> OCRBatcher:
+    """Get or create the OCR batcher singleton."""
+    global _ocr_batcher
+    if _ocr_batcher is None:
+        _ocr_batcher = OCRBatcher(
+            get_ocr_client(),
+            max_batch_size=settings.OCR_BATCH_SIZE,
+            max_wait_ms=settings.OCR_BATCH_WAIT_MS,
+        )
+    return _ocr_batcher
+
+
+def close_ocr_batcher() -> None:
+    """Close the OCR batcher singleton, if one was created."""
+    global _ocr_batcher
+    if _ocr_batcher is not None:
+        _ocr_batcher.close()
+        _ocr_batcher = None
@@ -3,6 +3,8 @@
 import uuid
 from typing import Optional
 
+from sqlalchemy import Text, bindparam, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from pill_checker.core.logging_config import logger
@@ -10,6 +12,24 @@ from pill_checker.models.profile import Profile
 from pill_checker.models.user import User
 from pill_checker.schemas.profile import ProfileUpdate
 
+# Built once; profile_id/user_id lookups are served by their unique indexes
+_PROFILE_BY_USER_STMT = select(Profile).where(Profile.user_id == bindparam("user_id"))
+
+# Inserts the profile only when the user exists and has none yet, defaulting the
+# username to the email's local part, and returns the new row in the same trip
+_CREATE_PROFILE_STMT = select(Profile).from_statement(
+    pg_insert(Profile)
+    .from_select(
+        [Profile.user_id, Profile.username],
+        select(
+            User.id,
+            func.coalesce(bindparam("username", type_=Text), func.split_part(User.email, "@", 1)),
+        ).where(User.id == bindparam("user_id")),
+    )
+    .on_conflict_do_nothing(index_elements=[Profile.user_id])
+    .returning(Profile)
+)
+
 
 class ProfileService:
     """Service for managing user profiles."""
@@ -29,8 +49,7 @@ class ProfileService:
             Profile if found, None otherwise
         """
         try:
-            profile = self.db.query(Profile).filter(Profile.user_id == user_id).first()
-            return profile
+            return self.db.scalar(_PROFILE_BY_USER_STMT, {"user_id": user_id})
         except Exception as e:
             logger.error(f"Error fetching profile for user {user_id}: {e}")
             return None
@@ -46,8 +65,8 @@ class ProfileService:
             Profile if found, None otherwise
         """
         try:
-            profile = self.db.query(Profile).filter(Profile.id == profile_id).first()
-            return profile
+            # Primary-key lookup; served from the identity map when already loaded
+            return self.db.get(Profile, profile_id)
         except Exception as e:
             logger.error(f"Error fetching profile {profile_id}: {e}")
             return None
@@ -66,27 +85,19 @@ class ProfileService:
             Created Profile or None if creation failed
         """
         try:
-            # Check if profile already exists
-            existing_profile = self.get_profile_by_user_id(user_id)
-            if existing_profile:
-                logger.warning(f"Profile already exists for user {user_id}")
-                return existing_profile
-
-            # Verify user exists
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if not user:
-                logger.error(f"User {user_id} not found")
-                return None
-
-            # Create new profile
-            profile = Profile(
-                user_id=user_id,
-                username=username or user.email.split("@")[0],
+            profile = self.db.scalar(
+                _CREATE_PROFILE_STMT, {"user_id": user_id, "username": username or None}
             )
+            if profile is None:
+                # Nothing inserted: either the profile exists or the user does not
+                existing_profile = self.get_profile_by_user_id(user_id)
+                if existing_profile:
+                    logger.warning(f"Profile already exists for user {user_id}")
+                else:
+                    logger.error(f"User {user_id} not found")
+                return existing_profile
 
-            self.db.add(profile)
             self.db.commit()
-            self.db.refresh(profile)
 
             logger.info(f"Profile created for user {user_id}")
             return profile
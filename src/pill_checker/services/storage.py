@@ -3,13 +3,22 @@
 import os
 import uuid
 from pathlib import Path
-from typing import BinaryIO, Optional
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Optional
 
 import aiofiles
+import aiofiles.os
 
 from pill_checker.core.config import settings
 from pill_checker.core.logging_config import logger
 
+# Default read size when streaming files back out of storage
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+
+async def _single_chunk(content: bytes) -> AsyncIterator[bytes]:
+    """Present in-memory content as a one-chunk stream."""
+    yield content
+
 
 class StorageService:
     """Service for handling file storage operations on local filesystem."""
@@ -42,20 +51,44 @@ class StorageService:
         Returns:
             str: Public URL/path to access the file
 
+        Raises:
+            Exception: If upload fails
+        """
+        return await self.upload_stream(_single_chunk(file_content), file_path, content_type)
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        file_path: str,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """
+        Upload a file to local storage chunk by chunk.
+
+        Only one chunk is held in memory at a time, so large uploads do not
+        have to be buffered in full.
+
+        Args:
+            chunks: File content as an async stream of byte chunks
+            file_path: Relative path where file should be stored
+            content_type: MIME type of the file (optional, for metadata)
+
+        Returns:
+            str: Public URL/path to access the file
+
         Raises:
             Exception: If upload fails
         """
         try:
             full_path = self.base_path / file_path
-            full_path.parent.mkdir(parents=True, exist_ok=True)
+            await aiofiles.os.makedirs(full_path.parent, exist_ok=True)
 
-            # Write file asynchronously
             async with aiofiles.open(full_path, "wb") as f:
-                await f.write(file_content)
+                async for chunk in chunks:
+                    await f.write(chunk)
 
             logger.info(f"File uploaded successfully to {file_path}")
 
-            # Return relative path that can be served by the application
             return f"/storage/{file_path}"
 
         except Exception as e:
@@ -75,7 +108,7 @@ class StorageService:
         try:
             full_path = self.base_path / file_path
 
-            if not full_path.exists():
+            if not await aiofiles.os.path.exists(full_path):
                 logger.warning(f"File not found: {file_path}")
                 return None
 
@@ -88,6 +121,29 @@ class StorageService:
             logger.error(f"Failed to download file from {file_path}: {e}")
             return None
 
+    async def iter_file(
+        self, file_path: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """
+        Read a file from local storage chunk by chunk.
+
+        Suited to streaming responses, since only one chunk is held in memory
+        at a time.
+
+        Args:
+            file_path: Relative path of the file to read
+            chunk_size: Maximum size of each chunk in bytes
+
+        Yields:
+            bytes: Successive chunks of the file content
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        async with aiofiles.open(self.base_path / file_path, "rb") as f:
+            while chunk := await f.read(chunk_size):
+                yield chunk
+
     async def delete_file(self, file_path: str) -> bool:
         """
         Delete a file from local storage.
@@ -101,8 +157,8 @@ class StorageService:
         try:
             full_path = self.base_path / file_path
 
-            if full_path.exists():
-                full_path.unlink()
+            if await aiofiles.os.path.exists(full_path):
+                await aiofiles.os.remove(full_path)
                 logger.info(f"File deleted successfully: {file_path}")
                 return True
             else:
@@ -113,6 +169,42 @@ class StorageService:
             logger.error(f"Failed to delete file {file_path}: {e}")
             return False
 
+    def get_local_path(self, file_path: str) -> Path:
+        """
+        Get the filesystem path of a stored file.
+
+        Lets routes hand the file to a FileResponse, which streams it with
+        sendfile instead of copying it through Python.
+
+        Args:
+            file_path: Relative path of the file
+
+        Returns:
+            Path: Location of the file under the storage base path
+
+        Raises:
+            ValueError: If the path points outside the storage base path
+        """
+        full_path = (self.base_path / file_path).resolve()
+        if not full_path.is_relative_to(self.base_path.resolve()):
+            raise ValueError(f"Path escapes storage: {file_path}")
+        return full_path
+
+    async def path_exists(self, file_path: str) -> bool:
+        """
+        Check whether a file exists in local storage.
+
+        Args:
+            file_path: Relative path of the file
+
+        Returns:
+            bool: True if the file exists, False otherwise
+        """
+        try:
+            return await aiofiles.os.path.isfile(self.get_local_path(file_path))
+        except ValueError:
+            return False
+
     def get_public_url(self, file_path: str) -> str:
         """
         Get public URL for a file.
@@ -0,0 +1,146 @@
+"""Tests for the medication list endpoint."""
+
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from pill_checker.api.v1.medications import router
+from pill_checker.core.database import get_async_db
+from pill_checker.models.medication import Medication
+from pill_checker.services.session_service import get_current_user
+
+TEST_USER_ID = uuid.uuid4()
+SCAN_DATE = datetime(2024, 1, 10, 12, 0, 0)
+
+
+class Row:
+    """Stand-in for a result row, exposing columns as attributes and via _mapping."""
+
+    def __init__(self, **columns):
+        self._mapping = columns
+        self.__dict__.update(columns)
+
+
+def _row(medication_id, total=None):
+    """Build a list row for a medication scanned a day apart from the previous one."""
+    scan_date = SCAN_DATE - timedelta(days=medication_id)
+    columns = {
+        "id": medication_id,
+        "profile_id": TEST_USER_ID,
+        "title": f"Medication {medication_id}",
+        "scan_date": scan_date,
+        "active_ingredients": ["Ibuprofen"],
+        "scanned_text": "text",
+        "dosage": "200mg",
+        "prescription_details": {},
+        "scan_url": None,
+        "created_at": scan_date,
+        "updated_at": scan_date,
+    }
+    if total is not None:
+        columns["total"] = total
+    return Row(**columns)
+
+
+@pytest.fixture
+def mock_db():
+    """Async session whose queries are answered by the test."""
+    return MagicMock(execute=AsyncMock())
+
+
+@pytest.fixture
+def test_client(mock_db):
+    """Client for an app serving only the medication routes."""
+    app = FastAPI()
+    app.include_router(router, prefix="/medications")
+    app.dependency_overrides[get_async_db] = lambda: mock_db
+    app.dependency_overrides[get_current_user] = lambda: {"id": str(TEST_USER_ID)}
+    return TestClient(app)
+
+
+class TestListMedications:
+    """Test pagination metadata of the medication list endpoint."""
+
+    def test_page_number_response(self, test_client, mock_db):
+        """Test that offset pages report their page number and count."""
+        page_result = MagicMock()
+        page_result.all.return_value = [_row(1, total=3), _row(2, total=3)]
+        mock_db.execute.return_value = page_result
+
+        body = test_client.get("/medications/list", params={"page": 1, "size": 2}).json()
+
+        assert [item["id"] for item in body["items"]] == [1, 2]
+        assert (body["total"], body["page"], body["size"], body["pages"]) == (3, 1, 2, 2)
+        assert body["next_cursor"]["after_id"] == 2
+
+    def test_cursor_response_has_no_page_number(self, test_client, mock_db):
+        """Test that cursor pages report page as null, since page was not used."""
+        page_result = MagicMock()
+        page_result.all.return_value = [_row(3, total=3)]
+        mock_db.execute.return_value = page_result
+
+        params = {
+            "page": 5,
+            "size": 2,
+            "after_scan_date": (SCAN_DATE - timedelta(days=2)).isoformat(),
+            "after_id": 2,
+        }
+        body = test_client.get("/medications/list", params=params).json()
+
+        assert [item["id"] for item in body["items"]] == [3]
+        assert body["page"] is None
+        assert (body["total"], body["size"], body["pages"]) == (3, 2, 2)
+        assert body["next_cursor"] is None
+        query_params = mock_db.execute.call_args_list[0].args[1]
+        assert (query_params["after_id"], query_params["size"]) == (2, 2)
+        # The total comes with the page instead of a separate COUNT query
+        assert mock_db.execute.await_count == 1
+
+    def test_next_cursor_fetches_following_page(self, test_client, mock_db):
+        """Test that a next_cursor passed back as-is binds the last row's sort key."""
+        first_page, second_page = MagicMock(), MagicMock()
+        first_page.all.return_value = [_row(1, total=3), _row(2, total=3)]
+        second_page.all.return_value = [_row(3, total=3)]
+        mock_db.execute.side_effect = [first_page, second_page]
+
+        cursor = test_client.get("/medications/list", params={"size": 2}).json()["next_cursor"]
+        test_client.get("/medications/list", params={**cursor, "size": 2})
+
+        query_params = mock_db.execute.call_args_list[1].args[1]
+        assert query_params["after_scan_date"] == SCAN_DATE - timedelta(days=2)
+        assert query_params["after_id"] == 2
+
+    def test_scan_date_is_never_null(self):
+        """Test that every row has a scan_date, so a cursor can always be built from it."""
+        scan_date = Medication.__table__.c.scan_date
+
+        assert scan_date.nullable is False
+        assert scan_date.server_default is not None
+
+    @pytest.mark.parametrize("params", [{"size": 0}, {"size": -1}, {"size": 101}, {"page": 0}])
+    def test_out_of_range_pagination_is_rejected(self, test_client, mock_db, params):
+        """Test that page and size outside their bounds fail validation before any query."""
+        response = test_client.get("/medications/list", params=params)
+
+        assert response.status_code == 422
+        mock_db.execute.assert_not_awaited()
+
+    def test_aware_cursor_is_bound_as_naive_utc(self, test_client, mock_db):
+        """Test that a cursor with a UTC offset matches the naive UTC scan_date column."""
+        page_result = MagicMock()
+        page_result.all.return_value = []
+        count_result = MagicMock()
+        count_result.scalar_one.return_value = 0
+        mock_db.execute.side_effect = [page_result, count_result]
+
+        params = {"after_scan_date": "2024-01-10T14:00:00+02:00", "after_id": 2}
+        response = test_client.get("/medications/list", params=params)
+
+        assert response.status_code == 200
+        query_params = mock_db.execute.call_args_list[0].args[1]
+        assert query_params["after_scan_date"] == SCAN_DATE
+        assert query_params["after_scan_date"].tzinfo is None
@@ -10,6 +10,7 @@ from PIL import Image
 
 from pill_checker.main import app
 from pill_checker.models.medication import Medication
+from pill_checker.models.ocr_result import OCRResult
 
 
 @pytest.fixture
@@ -63,24 +64,28 @@ class TestMedicationUploadIntegration:
 
         # Mock database
         mock_db = MagicMock()
+        mock_db.get.return_value = None
         mock_db.add = MagicMock()
         mock_db.commit = MagicMock()
 
-        def mock_refresh(medication):
+        def mock_flush():
+            medication = mock_db.add.call_args.args[0]
             medication.id = 1
             medication.created_at = "2025-01-01T00:00:00"
             medication.updated_at = "2025-01-01T00:00:00"
 
-        mock_db.refresh = mock_refresh
+        mock_db.flush = mock_flush
         mock_get_db.return_value = mock_db
 
         # Mock storage service
         mock_storage = MagicMock()
 
-        async def mock_upload(content, path, content_type=None):
+        async def mock_upload(chunks, path, content_type=None):
+            async for _ in chunks:
+                pass
             return f"/storage/{path}"
 
-        mock_storage.upload_file = mock_upload
+        mock_storage.upload_stream = mock_upload
         mock_get_storage.return_value = mock_storage
 
         # Mock OCR client
@@ -138,23 +143,27 @@ class TestMedicationUploadIntegration:
         mock_get_user.return_value = mock_current_user
 
         mock_db = MagicMock()
+        mock_db.get.return_value = None
         mock_db.add = MagicMock()
         mock_db.commit = MagicMock()
 
-        def mock_refresh(medication):
+        def mock_flush():
+            medication = mock_db.add.call_args.args[0]
             medication.id = 1
             medication.created_at = "2025-01-01T00:00:00"
             medication.updated_at = "2025-01-01T00:00:00"
 
-        mock_db.refresh = mock_refresh
+        mock_db.flush = mock_flush
         mock_get_db.return_value = mock_db
 
         mock_storage = MagicMock()
 
-        async def mock_upload(content, path, content_type=None):
+        async def mock_upload(chunks, path, content_type=None):
+            async for _ in chunks:
+                pass
             return f"/storage/{path}"
 
-        mock_storage.upload_file = mock_upload
+        mock_storage.upload_stream = mock_upload
         mock_get_storage.return_value = mock_storage
 
         mock_ocr_client = MagicMock()
@@ -193,21 +202,25 @@ class TestMedicationUploadIntegration:
         mock_get_user.return_value = mock_current_user
 
         mock_db = MagicMock()
+        mock_db.get.return_value = None
 
-        def mock_refresh(medication):
+        def mock_flush():
+            medication = mock_db.add.call_args.args[0]
             medication.id = 1
             medication.created_at = "2025-01-01T00:00:00"
             medication.updated_at = "2025-01-01T00:00:00"
 
-        mock_db.refresh = mock_refresh
+        mock_db.flush = mock_flush
         mock_get_db.return_value = mock_db
 
         mock_storage = MagicMock()
 
-        async def mock_upload(content, path, content_type=None):
+        async def mock_upload(chunks, path, content_type=None):
+            async for _ in chunks:
+                pass
             return f"/storage/{path}"
 
-        mock_storage.upload_file = mock_upload
+        mock_storage.upload_stream = mock_upload
         mock_get_storage.return_value = mock_storage
 
         mock_ocr_client = MagicMock()
@@ -279,21 +292,25 @@ class TestMedicationUploadIntegration:
         mock_get_user.return_value = mock_current_user
 
         mock_db = MagicMock()
+        mock_db.get.return_value = None
 
-        def mock_refresh(medication):
+        def mock_flush():
+            medication = mock_db.add.call_args.args[0]
             medication.id = 1
             medication.created_at = "2025-01-01T00:00:00"
             medication.updated_at = "2025-01-01T00:00:00"
 
-        mock_db.refresh = mock_refresh
+        mock_db.flush = mock_flush
         mock_get_db.return_value = mock_db
 
         mock_storage = MagicMock()
 
-        async def mock_upload(content, path, content_type=None):
+        async def mock_upload(chunks, path, content_type=None):
+            async for _ in chunks:
+                pass
             return f"/storage/{path}"
 
-        mock_storage.upload_file = mock_upload
+        mock_storage.upload_stream = mock_upload
         mock_get_storage.return_value = mock_storage
 
         mock_ocr_client = MagicMock()
@@ -367,21 +384,25 @@ class TestMedicationUploadIntegration:
         mock_get_user.return_value = mock_current_user
 
         mock_db = MagicMock()
+        mock_db.get.return_value = None
 
-        def mock_refresh(medication):
+        def mock_flush():
+            medication = mock_db.add.call_args.args[0]
             medication.id = 1
             medication.created_at = "2025-01-01T00:00:00"
             medication.updated_at = "2025-01-01T00:00:00"
 
-        mock_db.refresh = mock_refresh
+        mock_db.flush = mock_flush
         mock_get_db.return_value = mock_db
 
         mock_storage = MagicMock()
 
-        async def mock_upload(content, path, content_type=None):
+        async def mock_upload(chunks, path, content_type=None):
+            async for _ in chunks:
+                pass
             return f"/storage/{path}"
 
-        mock_storage.upload_file = mock_upload
+        mock_storage.upload_stream = mock_upload
         mock_get_storage.return_value = mock_storage
 
         mock_ocr_client = MagicMock()
@@ -405,3 +426,59 @@ class TestMedicationUploadIntegration:
         assert "morning" in details["timing"].lower()
         assert "expiry_date" in details
         assert "12/2025" in details["expiry_date"]
+
+    @patch("pill_checker.api.v1.medications.get_current_user")
+    @patch("pill_checker.api.v1.medications.get_db")
+    @patch("pill_checker.api.v1.medications.get_storage_service")
+    @patch("pill_checker.services.ocr.get_ocr_client")
+    def test_upload_medication_reuses_cached_ocr(
+        self,
+        mock_get_ocr,
+        mock_get_storage,
+        mock_get_db,
+        mock_get_user,
+        test_client,
+        mock_current_user,
+        sample_medication_image,
+        mock_ner_client,
+    ):
+        """Test that a previously processed image skips OCR and NER."""
+        mock_get_user.return_value = mock_current_user
+
+        mock_db = MagicMock()
+        mock_db.get.return_value = OCRResult(
+            digest="0" * 64,
+            ocr_text="Ibuprofen 200mg tablets. Take for pain.",
+            entities=[],
+        )
+
+        def mock_flush():
+            medication = mock_db.add.call_args.args[0]
+            medication.id = 1
+            medication.created_at = "2025-01-01T00:00:00"
+            medication.updated_at = "2025-01-01T00:00:00"
+
+        mock_db.flush = mock_flush
+        mock_get_db.return_value = mock_db
+
+        mock_storage = MagicMock()
+
+        async def mock_upload(chunks, path, content_type=None):
+            async for _ in chunks:
+                pass
+            return f"/storage/{path}"
+
+        mock_storage.upload_stream = mock_upload
+        mock_get_storage.return_value = mock_storage
+
+        mock_ocr_client = MagicMock()
+        mock_get_ocr.return_value = mock_ocr_client
+
+        files = {"image": ("medication.png", sample_medication_image, "image/png")}
+        response = test_client.post("/api/v1/medications/upload", files=files)
+
+        assert response.status_code == 200
+        assert response.json()["scanned_text"] == "Ibuprofen 200mg tablets. Take for pain."
+        mock_ocr_client.read_text.assert_not_called()
+        mock_ner_client.extract_entities.assert_not_called()
+        mock_db.execute.assert_not_called()
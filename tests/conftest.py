@@ -32,6 +32,7 @@ else:
             "STORAGE_PATH": "./test_storage",
             "STORAGE_BASE_URL": "http://localhost:8000",
             "SKIP_REAL_OCR_TESTS": "True",
+            "OCR_WARMUP": "False",
         }
     )
 
@@ -259,3 +259,17 @@ def test_model_relationships(test_db_session):
 
     # Restore original execute method
     test_db_session.execute = original_execute
+
+
+def test_model_dict_uses_table_columns():
+    """Test that dict() returns every column of the model's table."""
+    profile_id = uuid.uuid4()
+    profile = Profile(id=profile_id, username="Test User", bio="Test bio")
+
+    data = profile.dict()
+
+    assert set(data) == {c.name for c in Profile.__table__.columns}
+    assert data["id"] == profile_id
+    assert data["username"] == "Test User"
+    assert data["bio"] == "Test bio"
+    assert data["user_id"] is None
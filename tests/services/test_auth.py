@@ -1,15 +1,29 @@
 """Tests for authentication service and endpoints."""
 
+import asyncio
+import json
 import uuid
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.testclient import TestClient
+from fastapi_users.jwt import decode_jwt
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 
+from pill_checker.api.v1.auth import _user_payload, get_current_user_info, register_with_profile
 from pill_checker.api.v1.auth import router as auth_router
-from pill_checker.core.security import setup_security
+from pill_checker.core import security as security_module
+from pill_checker.core.security import limiter, rate_limit_key, setup_security
 from pill_checker.models.user import User
+from pill_checker.schemas.user import UserCreate, UserRead
+from pill_checker.services.auth_manager import (
+    UserDatabase,
+    UserManager,
+    _verified_tokens,
+    get_jwt_strategy,
+)
 
 # Test data
 TEST_USER_EMAIL = "test@example.com"
@@ -109,6 +123,34 @@ class TestAuthEndpoints:
         # Verify the custom registration endpoint is included
         assert auth_router is not None
 
+    def test_register_with_profile_ignores_privileged_fields(self):
+        """Test that clients cannot grant themselves superuser or verified status."""
+        user_db = MagicMock()
+        user_db.get_by_email = AsyncMock(return_value=None)
+        user_db.create = AsyncMock(
+            return_value=User(
+                id=TEST_USER_ID,
+                email=TEST_USER_EMAIL,
+                hashed_password="hashed",
+                is_active=True,
+                is_superuser=False,
+                is_verified=False,
+            )
+        )
+        user_create = UserCreate(
+            email=TEST_USER_EMAIL,
+            password=TEST_USER_PASSWORD,
+            is_superuser=True,
+            is_verified=True,
+        )
+        request = Request({"type": "http", "headers": []})
+
+        asyncio.run(register_with_profile(request, user_create, UserManager(user_db)))
+
+        create_dict = user_db.create.await_args.args[0]
+        assert "is_superuser" not in create_dict
+        assert "is_verified" not in create_dict
+
     def test_auth_router_includes_fastapi_users_routes(self, mock_fastapi_users):
         """Test that FastAPI-Users routes are included."""
         # Verify that FastAPI-Users routers were called
@@ -119,6 +161,257 @@ class TestAuthEndpoints:
         mock_fastapi_users.get_users_router.assert_called()
 
 
+class TestMeEndpoint:
+    """Test suite for the /me payload cache."""
+
+    def _user(self, **overrides):
+        """Create a user for the /me endpoint."""
+        fields = {
+            "id": TEST_USER_ID,
+            "email": TEST_USER_EMAIL,
+            "hashed_password": "hashed",
+            "is_active": True,
+            "is_superuser": False,
+            "is_verified": True,
+        }
+        fields.update(overrides)
+        return User(**fields)
+
+    def _request(self, if_none_match=None):
+        """Create a GET /me request, optionally conditional."""
+        headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+        return Request({"type": "http", "method": "GET", "path": "/me", "headers": headers})
+
+    def test_me_returns_user_json(self):
+        """Test that /me returns the UserRead representation."""
+        response = asyncio.run(get_current_user_info(self._request(), self._user()))
+
+        assert response.media_type == "application/json"
+        assert response.headers["ETag"].startswith('W/"')
+        assert json.loads(response.body) == UserRead.model_validate(self._user()).model_dump(
+            mode="json"
+        )
+
+    def test_me_not_modified_for_matching_etag(self):
+        """Test that a matching If-None-Match gets an empty 304."""
+        etag = asyncio.run(get_current_user_info(self._request(), self._user())).headers["ETag"]
+
+        response = asyncio.run(get_current_user_info(self._request(etag), self._user()))
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["ETag"] == etag
+
+    def test_me_reuses_serialized_payload(self):
+        """Test that an unchanged user is serialized only once."""
+        _user_payload(self._user(email="cached@example.com"))
+
+        with patch.object(UserRead, "model_validate") as validate:
+            asyncio.run(
+                get_current_user_info(self._request(), self._user(email="cached@example.com"))
+            )
+
+        validate.assert_not_called()
+
+    def test_me_payload_tracks_user_changes(self):
+        """Test that changed user fields produce a fresh payload."""
+        before, before_etag = _user_payload(self._user(is_verified=False))
+        after, after_etag = _user_payload(self._user(is_verified=True))
+
+        assert json.loads(before)["is_verified"] is False
+        assert json.loads(after)["is_verified"] is True
+        assert before_etag != after_etag
+
+
+class TestJWTStrategy:
+    """Test suite for the cached JWT strategy."""
+
+    @pytest.fixture(autouse=True)
+    def clear_token_cache(self):
+        """Start each test with an empty token cache."""
+        _verified_tokens.clear()
+        yield
+        _verified_tokens.clear()
+
+    def _user_manager(self):
+        """Create a user manager mock that resolves any ID to a user."""
+        user = User(id=TEST_USER_ID, email=TEST_USER_EMAIL, hashed_password="hashed")
+        manager = MagicMock()
+        manager.parse_id.side_effect = uuid.UUID
+        manager.get = AsyncMock(return_value=user)
+        return manager, user
+
+    def test_read_token_verifies_once(self):
+        """Test that a repeated token skips signature verification."""
+        strategy = get_jwt_strategy()
+        manager, user = self._user_manager()
+        token = asyncio.run(strategy.write_token(user))
+
+        with patch("pill_checker.services.auth_manager.decode_jwt", wraps=decode_jwt) as decode:
+            assert asyncio.run(strategy.read_token(token, manager)) is user
+            assert asyncio.run(get_jwt_strategy().read_token(token, manager)) is user
+
+        decode.assert_called_once()
+        assert manager.get.await_count == 2
+
+    def test_read_token_rejects_invalid_token(self):
+        """Test that invalid tokens are not cached."""
+        manager, _ = self._user_manager()
+
+        assert asyncio.run(get_jwt_strategy().read_token("not-a-jwt", manager)) is None
+        assert len(_verified_tokens) == 0
+        manager.get.assert_not_awaited()
+
+    def test_expired_cache_entry_is_reverified(self):
+        """Test that entries past their expiry are verified again."""
+        strategy = get_jwt_strategy()
+        manager, user = self._user_manager()
+        token = asyncio.run(strategy.write_token(user))
+        asyncio.run(strategy.read_token(token, manager))
+
+        key = next(iter(_verified_tokens))
+        _verified_tokens[key] = (str(TEST_USER_ID), 0.0)
+
+        with patch("pill_checker.services.auth_manager.decode_jwt", wraps=decode_jwt) as decode:
+            assert asyncio.run(strategy.read_token(token, manager)) is user
+
+        decode.assert_called_once()
+
+    def test_strategy_is_shared(self):
+        """Test that every request gets the same strategy instance."""
+        assert get_jwt_strategy() is get_jwt_strategy()
+
+
+class TestRateLimiting:
+    """Test suite for rate limit keys and exemptions."""
+
+    @pytest.fixture(autouse=True)
+    def reset_limits(self):
+        """Start each test with empty rate limit counters."""
+        limiter.reset()
+        yield
+        limiter.reset()
+
+    def _request(self, authorization=None):
+        """Build a request from a fixed client address."""
+        headers = [(b"authorization", authorization.encode())] if authorization else []
+        return Request({"type": "http", "headers": headers, "client": ("203.0.113.7", 1234)})
+
+    def test_key_uses_token_user(self):
+        """Test that authenticated requests are limited per user, not per address."""
+        user = User(id=TEST_USER_ID, email=TEST_USER_EMAIL, hashed_password="hashed")
+        token = asyncio.run(get_jwt_strategy().write_token(user))
+
+        assert rate_limit_key(self._request(f"Bearer {token}")) == f"user:{TEST_USER_ID}"
+
+    def test_key_falls_back_to_client_address(self):
+        """Test that anonymous or invalid-token requests are limited per address."""
+        assert rate_limit_key(self._request()) == "203.0.113.7"
+        assert rate_limit_key(self._request("Bearer not-a-jwt")) == "203.0.113.7"
+
+    def test_exempt_route_is_not_limited(self):
+        """Test that exempt routes such as health checks never get 429."""
+        app = FastAPI()
+        setup_security(app)
+
+        @app.get("/limited")
+        async def limited():
+            return {}
+
+        @app.get("/health")
+        @limiter.exempt
+        async def health():
+            return {}
+
+        client = TestClient(app)
+        limited_codes = {client.get("/limited").status_code for _ in range(15)}
+        health_codes = {client.get("/health").status_code for _ in range(15)}
+
+        assert 429 in limited_codes
+        assert health_codes == {200}
+
+    def test_rate_limited_response_has_cors_headers(self):
+        """Test that 429 responses still carry CORS headers for browser clients."""
+        origin = "http://localhost:3000"
+        cors_settings = security_module.settings.model_copy(
+            update={"BACKEND_CORS_ORIGINS": [origin]}
+        )
+        app = FastAPI()
+        with patch.object(security_module, "settings", cors_settings):
+            setup_security(app)
+
+        @app.get("/limited")
+        async def limited():
+            return {}
+
+        client = TestClient(app)
+        responses = [client.get("/limited", headers={"Origin": origin}) for _ in range(15)]
+        limited = [r for r in responses if r.status_code == 429]
+
+        assert limited
+        assert limited[0].headers["access-control-allow-origin"] == origin
+
+
+class TestUserDatabase:
+    """Test suite for the user database adapter."""
+
+    def _create(self, create_dict):
+        """Create a user through UserDatabase with a mocked async session."""
+        session = MagicMock()
+        session.commit = AsyncMock()
+        session.refresh = AsyncMock()
+        user = asyncio.run(UserDatabase(session, User).create(create_dict))
+        return session, user
+
+    def test_create_adds_profile_in_same_commit(self):
+        """Test that the profile is created with the user in one transaction."""
+        session, user = self._create(
+            {"email": TEST_USER_EMAIL, "hashed_password": "hashed", "username": TEST_USERNAME}
+        )
+
+        session.add.assert_called_once_with(user)
+        session.commit.assert_awaited_once()
+        assert user.profile.username == TEST_USERNAME
+
+    def test_create_leaves_username_empty_by_default(self):
+        """Test that no username is derived from the email, so it cannot collide."""
+        _, user = self._create({"email": TEST_USER_EMAIL, "hashed_password": "hashed"})
+
+        assert user.profile.username is None
+
+    def test_create_rolls_back_on_constraint_violation(self):
+        """Test that a failed commit leaves the session usable."""
+        session = MagicMock()
+        session.commit = AsyncMock(side_effect=IntegrityError("INSERT", {}, Exception("dup")))
+        session.rollback = AsyncMock()
+
+        with pytest.raises(IntegrityError):
+            asyncio.run(
+                UserDatabase(session, User).create(
+                    {"email": TEST_USER_EMAIL, "hashed_password": "hashed", "username": "taken"}
+                )
+            )
+        session.rollback.assert_awaited_once()
+
+    def test_manager_reports_constraint_violation_as_400(self):
+        """Test that a taken username fails registration with 400 instead of 500."""
+        user_db = MagicMock()
+        user_db.get_by_email = AsyncMock(return_value=None)
+        user_db.create = AsyncMock(side_effect=IntegrityError("INSERT", {}, Exception("dup")))
+        user_create = UserCreate(
+            email=TEST_USER_EMAIL, password=TEST_USER_PASSWORD, username="taken"
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(UserManager(user_db).create(user_create))
+        assert exc_info.value.status_code == 400
+
+    def test_short_username_is_rejected_by_schema(self):
+        """Test that usernames the database would reject fail validation up front."""
+        with pytest.raises(ValidationError):
+            UserCreate(email=TEST_USER_EMAIL, password=TEST_USER_PASSWORD, username="jo")
+
+
 class TestProfileService:
     """Test suite for profile service."""
 
@@ -153,6 +446,17 @@ class TestStorageService:
         service = get_storage_service()
         assert service is not None
 
+    def test_get_local_path_stays_in_storage(self):
+        """Test that local paths resolve under the base path and cannot escape it."""
+        from pill_checker.services.storage import StorageService
+
+        service = StorageService(base_path="/tmp/test_storage")
+
+        path = service.get_local_path("test/file.txt")
+        assert path == service.base_path.resolve() / "test/file.txt"
+        with pytest.raises(ValueError):
+            service.get_local_path("../outside.txt")
+
     @pytest.mark.asyncio
     async def test_storage_upload(self):
         """Test file upload functionality."""
@@ -168,3 +472,37 @@ class TestStorageService:
 
         # Clean up
         await service.delete_file(test_path)
+
+    @pytest.mark.asyncio
+    async def test_storage_upload_stream(self):
+        """Test chunked file upload functionality."""
+        from pill_checker.services.storage import StorageService
+
+        service = StorageService(base_path="/tmp/test_storage")
+        test_path = "test/streamed.txt"
+
+        async def chunks():
+            yield b"test file "
+            yield b"content"
+
+        url = await service.upload_stream(chunks(), test_path)
+        assert url == f"/storage/{test_path}"
+        assert await service.download_file(test_path) == b"test file content"
+
+        # Clean up
+        await service.delete_file(test_path)
+
+    @pytest.mark.asyncio
+    async def test_storage_iter_file(self):
+        """Test chunked file read functionality."""
+        from pill_checker.services.storage import StorageService
+
+        service = StorageService(base_path="/tmp/test_storage")
+        test_path = "test/chunked.txt"
+        await service.upload_file(b"test file content", test_path)
+
+        chunks = [chunk async for chunk in service.iter_file(test_path, chunk_size=8)]
+        assert chunks == [b"test fil", b"e conten", b"t"]
+
+        # Clean up
+        await service.delete_file(test_path)
@@ -4,7 +4,13 @@ import pytest
 from unittest.mock import Mock, patch
 import requests
 
-from pill_checker.services.biomed_ner_client import MedicalNERClient, get_ner_client
+from pill_checker.services.biomed_ner_client import (
+    MedicalNERClient,
+    close_ner_client,
+    close_ner_executor,
+    get_ner_client,
+    get_ner_executor,
+)
 
 
 class TestMedicalNERClient:
@@ -68,7 +74,7 @@ class TestMedicalNERClient:
         with pytest.raises(ValueError, match="BIOMED_HOST"):
             MedicalNERClient()
 
-    @patch("pill_checker.services.biomed_ner_client.requests.post")
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
     def test_extract_entities_success(
         self, mock_post, ner_client, sample_entities_response
     ):
@@ -96,7 +102,7 @@ class TestMedicalNERClient:
         assert "umls_entities" in entities[0]
         assert entities[0]["umls_entities"][0]["canonical_name"] == "Ibuprofen"
 
-    @patch("pill_checker.services.biomed_ner_client.requests.post")
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
     def test_extract_entities_empty_text(self, mock_post, ner_client):
         """Test that empty text returns empty list."""
         result = ner_client.extract_entities("")
@@ -107,7 +113,7 @@ class TestMedicalNERClient:
         assert result == []
         mock_post.assert_not_called()
 
-    @patch("pill_checker.services.biomed_ner_client.requests.post")
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
     def test_extract_entities_api_error(self, mock_post, ner_client):
         """Test handling of API errors."""
         mock_response = Mock()
@@ -118,7 +124,7 @@ class TestMedicalNERClient:
         with pytest.raises(RuntimeError, match="API call failed with status 500"):
             ner_client.extract_entities("Test text")
 
-    @patch("pill_checker.services.biomed_ner_client.requests.post")
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
     def test_extract_entities_timeout(self, mock_post, ner_client):
         """Test handling of timeout errors."""
         mock_post.side_effect = requests.exceptions.Timeout()
@@ -126,7 +132,7 @@ class TestMedicalNERClient:
         with pytest.raises(RuntimeError, match="timed out"):
             ner_client.extract_entities("Test text")
 
-    @patch("pill_checker.services.biomed_ner_client.requests.post")
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
     def test_extract_entities_connection_error(self, mock_post, ner_client):
         """Test handling of connection errors."""
         mock_post.side_effect = requests.exceptions.ConnectionError()
@@ -134,7 +140,7 @@ class TestMedicalNERClient:
         with pytest.raises(RuntimeError, match="Failed to connect"):
             ner_client.extract_entities("Test text")
 
-    @patch("pill_checker.services.biomed_ner_client.requests.post")
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
     def test_extract_entities_retry(self, mock_post, ner_client):
         """Test retry logic on transient failures."""
         # First two calls fail, third succeeds
@@ -157,7 +163,7 @@ class TestMedicalNERClient:
         assert entities == []
         assert mock_post.call_count == 3
 
-    @patch("pill_checker.services.biomed_ner_client.requests.post")
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
     def test_find_active_ingredients(self, mock_post, ner_client, sample_entities_response):
         """Test extracting active ingredient names."""
         mock_response = Mock()
@@ -171,7 +177,24 @@ class TestMedicalNERClient:
         assert "Ibuprofen" in ingredients
         assert "Headache" in ingredients
 
-    @patch("pill_checker.services.biomed_ner_client.requests.post")
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
+    def test_find_active_ingredients_deduplicates(self, mock_post, ner_client):
+        """Test that repeated mentions are returned once, in order of first mention."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "entities": [
+                {"text": name.lower(), "umls_entities": [{"canonical_name": name}]}
+                for name in ["Ibuprofen", "Caffeine", "IBUPROFEN", "Ibuprofen"]
+            ]
+        }
+        mock_post.return_value = mock_response
+
+        ingredients = ner_client.find_active_ingredients("Ibuprofen and caffeine")
+
+        assert ingredients == ["Ibuprofen", "Caffeine"]
+
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
     def test_get_entity_details(self, mock_post, ner_client, sample_entities_response):
         """Test extracting full entity details."""
         mock_response = Mock()
@@ -186,6 +209,61 @@ class TestMedicalNERClient:
         assert entities[0]["umls_entities"][0]["canonical_name"] == "Ibuprofen"
         assert "Advil" in entities[0]["umls_entities"][0]["aliases"]
 
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
+    def test_extract_entities_cached(self, mock_post, ner_client, sample_entities_response):
+        """Test that repeated text is served from the cache until cleared."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = sample_entities_response
+        mock_post.return_value = mock_response
+
+        first = ner_client.extract_entities("Ibuprofen 200mg")
+        second = ner_client.extract_entities("Ibuprofen 200mg")
+
+        assert first == second
+        assert mock_post.call_count == 1
+
+        ner_client.clear_cache()
+        ner_client.extract_entities("Ibuprofen 200mg")
+
+        assert mock_post.call_count == 2
+
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
+    def test_cached_entities_are_isolated_from_callers(
+        self, mock_post, ner_client, sample_entities_response
+    ):
+        """Test that mutating returned entities does not change later cache hits."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = sample_entities_response
+        mock_post.return_value = mock_response
+
+        first = ner_client.extract_entities("Ibuprofen 200mg")
+        first[0]["text"] = "changed"
+        first[0]["umls_entities"].clear()
+        second = ner_client.extract_entities("Ibuprofen 200mg")
+        second[0]["umls_entities"][0]["aliases"].append("changed")
+        third = ner_client.extract_entities("Ibuprofen 200mg")
+
+        assert third[0]["text"] == "ibuprofen"
+        assert "changed" not in third[0]["umls_entities"][0]["aliases"]
+
+    @patch("pill_checker.services.biomed_ner_client.time.monotonic")
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
+    def test_extract_entities_cache_expires(self, mock_post, mock_monotonic, ner_client):
+        """Test that cached results are refetched after the TTL."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"entities": []}
+        mock_post.return_value = mock_response
+
+        mock_monotonic.return_value = 1000.0
+        ner_client.extract_entities("Aspirin")
+        mock_monotonic.return_value = 1000.0 + 24 * 3600
+        ner_client.extract_entities("Aspirin")
+
+        assert mock_post.call_count == 2
+
     def test_get_ner_client_singleton(self, mock_api_url):
         """Test that get_ner_client returns singleton."""
         # Reset global client
@@ -199,7 +277,40 @@ class TestMedicalNERClient:
         assert client1 is client2
         assert client1.api_url == mock_api_url
 
-    @patch("pill_checker.services.biomed_ner_client.requests.post")
+    def test_close_ner_client(self, mock_api_url):
+        """Test that closing the singleton closes its session and drops it."""
+        import pill_checker.services.biomed_ner_client as ner_module
+
+        ner_module._ner_client = None
+        client = get_ner_client(api_url=mock_api_url)
+
+        with patch.object(client._session, "close") as mock_close:
+            close_ner_client()
+
+        mock_close.assert_called_once()
+        assert ner_module._ner_client is None
+
+    def test_session_reused_across_calls(self, ner_client):
+        """Test that requests share the client's pooled session."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"entities": []}
+
+        with patch.object(ner_client._session, "post", return_value=mock_response) as mock_post:
+            ner_client.extract_entities("First text")
+            ner_client.extract_entities("Second text")
+
+        assert mock_post.call_count == 2
+
+    def test_get_ner_executor_singleton(self):
+        """Test that NER calls share one dedicated worker pool."""
+        executor1 = get_ner_executor()
+        executor2 = get_ner_executor()
+
+        assert executor1 is executor2
+        assert executor1.submit(lambda: "done").result(timeout=5) == "done"
+
+    @patch("pill_checker.services.biomed_ner_client.requests.Session.post")
     def test_custom_timeout(self, mock_post, ner_client):
         """Test custom timeout parameter."""
         mock_response = Mock()
@@ -211,3 +322,13 @@ class TestMedicalNERClient:
 
         call_args = mock_post.call_args
         assert call_args[1]["timeout"] == 60
+
+    def test_close_ner_executor(self):
+        """Test that closing the worker pool shuts it down and a new one is made on demand."""
+        executor = get_ner_executor()
+
+        close_ner_executor()
+
+        with pytest.raises(RuntimeError):
+            executor.submit(lambda: "late")
+        assert get_ner_executor() is not executor
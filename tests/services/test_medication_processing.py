@@ -31,6 +31,19 @@ class TestExtractDosage:
         result = extract_dosage(text)
         assert result == expected
 
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            # Earlier patterns win even when a later one matches further left
+            ("1% cream 30 g", "30 g"),
+            ("2.5% gel, 50 ml tube", "50 ml"),
+            ("Take 200mg, then 5/10mg", "5/10mg"),
+        ],
+    )
+    def test_extract_dosage_pattern_priority(self, text, expected):
+        """Test that dosage patterns are tried in priority order, not by position."""
+        assert extract_dosage(text) == expected
+
     def test_extract_dosage_not_found(self):
         """Test when no dosage is present."""
         result = extract_dosage("Take this medication as prescribed")
@@ -248,6 +261,24 @@ class TestExtractPrescriptionDetails:
             details = extract_prescription_details(text, entities=[])
             assert expected_key in details
 
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            ("every 4 hours, 2 times a day", "every 4 hours"),
+            ("2 times a day or twice a day", "twice"),
+            ("twice a day, every 6 hours", "every 6 hours"),
+        ],
+    )
+    def test_extract_frequency_pattern_priority(self, text, expected):
+        """Test that the highest-priority frequency pattern wins, not the leftmost match."""
+        details = extract_prescription_details(text, entities=[])
+        assert details["frequency"] == expected
+
+    def test_extract_expiry_prefers_full_date(self):
+        """Test that a full expiry date is preferred over an earlier year-month."""
+        details = extract_prescription_details("Exp 2024-05 exp: 12/05/2025", entities=[])
+        assert details["expiry_date"] == "12/05/2025"
+
     def test_extract_timing(self):
         """Test extracting timing information."""
         text = "Take in the morning with food"
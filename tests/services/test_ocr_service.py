@@ -1,12 +1,14 @@
 """Tests for the OCR service."""
 
+import asyncio
 import io
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 from PIL import Image
 
-from pill_checker.services.ocr import EasyOCRClient, get_ocr_client
+from pill_checker.services.ocr import EasyOCRClient, OCRBatcher, get_ocr_client
 
 
 class MockReader:
@@ -16,6 +18,11 @@ class MockReader:
         """Return simulated OCR results."""
         return ["Mock OCR text", "for testing", "purposes"]
 
+    def readtext_batched(self, images, n_width=None, n_height=None, batch_size=1, detail=0):
+        """Return simulated OCR results for each image in the batch."""
+        self.batch = images
+        return [[f"Mock OCR text {i}"] for i in range(len(images))]
+
 
 @pytest.fixture
 def mock_ocr_client():
@@ -55,6 +62,30 @@ class TestOCRService:
         assert mock_ocr_client.reader is not None
         assert mock_ocr_client.languages == ["en"]
 
+    def test_easyocr_client_reader_options(self):
+        """Test that quantization and GPU options are passed to the reader."""
+        with patch("easyocr.Reader") as mock_reader_class:
+            mock_reader_class.return_value.device = "cpu"
+
+            client = EasyOCRClient(gpu=False, quantize=True, fp16=True)
+
+        mock_reader_class.assert_called_once_with(
+            ["en"], gpu=False, quantize=True, cudnn_benchmark=True
+        )
+        # Half precision only applies on CUDA
+        assert client.fp16 is False
+
+    def test_warm_up_runs_blank_batch(self):
+        """Test that warm-up pushes a blank batch of the configured size."""
+        client = EasyOCRClient.__new__(EasyOCRClient)
+        client.reader = MagicMock()
+
+        client.warm_up(batch_size=4)
+
+        batch = client.reader.readtext_batched.call_args.args[0]
+        assert batch.shape == (4, EasyOCRClient.BATCH_HEIGHT, EasyOCRClient.BATCH_WIDTH, 3)
+        assert not batch.any()
+
     def test_read_text_function(self, mock_ocr_client, test_image):
         """Test the read_text function with a mock image."""
         # Prepare image data
@@ -69,12 +100,45 @@ class TestOCRService:
         assert "Mock OCR text" in result
         mock_ocr_client.read_text.assert_called_once()
 
+    def test_read_text_passes_array_to_reader(self, test_image):
+        """Test that read_text hands EasyOCR a decoded array, not encoded bytes."""
+        client = EasyOCRClient.__new__(EasyOCRClient)
+        client.reader = MagicMock()
+        client.reader.readtext.return_value = ["Ibuprofen", "200mg"]
+
+        image_bytes = io.BytesIO()
+        test_image.save(image_bytes, format="PNG")
+
+        result = client.read_text(image_bytes.getvalue())
+
+        assert result == "Ibuprofen 200mg"
+        image_arg = client.reader.readtext.call_args.args[0]
+        assert isinstance(image_arg, np.ndarray)
+        assert image_arg.shape == (80, 80)  # resized x2, then cropped by 10px
+
     def test_preprocess_grayscale(self, test_image):
         """Test grayscale conversion."""
         client = EasyOCRClient.__new__(EasyOCRClient)
         result = client.preprocess_grayscale(test_image)
         assert result.mode == "L"
 
+    def test_preprocess_grayscale_already_grayscale(self, test_image):
+        """Test that grayscale input is not converted again."""
+        client = EasyOCRClient.__new__(EasyOCRClient)
+        grayscale = test_image.convert("L")
+        assert client.preprocess_grayscale(grayscale) is grayscale
+
+    def test_load_image_large_jpeg_is_drafted(self):
+        """Test that large JPEGs are decoded to grayscale at reduced scale."""
+        client = EasyOCRClient.__new__(EasyOCRClient)
+        image_bytes = io.BytesIO()
+        Image.new("RGB", (4000, 3000), (255, 255, 255)).save(image_bytes, format="JPEG")
+
+        image = client.load_image(image_bytes.getvalue())
+
+        assert image.mode == "L"
+        assert image.size == (2000, 1500)
+
     def test_preprocess_contrast(self, test_image):
         """Test contrast enhancement."""
         client = EasyOCRClient.__new__(EasyOCRClient)
@@ -139,3 +203,136 @@ class TestOCRService:
         finally:
             # Restore original client
             ocr_module._ocr_client = original_client
+
+
+class TestBatchedOCR:
+    """Test batched OCR and request coalescing."""
+
+    def _image_bytes(self, test_image):
+        buffer = io.BytesIO()
+        test_image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def test_read_text_batch(self, test_image):
+        """Test that a batch returns one text per image, in order."""
+        client = EasyOCRClient.__new__(EasyOCRClient)
+        client.reader = MockReader()
+
+        image = self._image_bytes(test_image)
+        result = client.read_text_batch([image, image, image])
+
+        assert result == ["Mock OCR text 0", "Mock OCR text 1", "Mock OCR text 2"]
+
+    def test_read_text_batch_pads_without_stretching(self):
+        """Test that differently sized images are padded to a shared canvas, not resized."""
+        client = EasyOCRClient.__new__(EasyOCRClient)
+        client.reader = MockReader()
+        small, tall = np.zeros((20, 30), np.uint8), np.zeros((50, 10), np.uint8)
+
+        with patch.object(client, "prepare_image", side_effect=[small, tall]):
+            client.read_text_batch([b"small", b"tall"])
+
+        padded_small, padded_tall = client.reader.batch
+        assert padded_small.shape == padded_tall.shape == (50, 30)
+        assert np.array_equal(padded_small[:20, :30], small)
+        assert (padded_small[20:] == EasyOCRClient.PAD_VALUE).all()
+        assert np.array_equal(padded_tall[:50, :10], tall)
+
+    def test_read_text_batch_isolates_bad_images(self, test_image):
+        """Test that an undecodable image is reported in its slot and the rest are read."""
+        client = EasyOCRClient.__new__(EasyOCRClient)
+        client.reader = MockReader()
+
+        image = self._image_bytes(test_image)
+        result = client.read_text_batch([image, b"not an image", image], return_exceptions=True)
+
+        assert result[0] == "Mock OCR text 0"
+        assert isinstance(result[1], Exception)
+        assert result[2] == "Mock OCR text 1"
+        assert len(client.reader.batch) == 2
+
+    def test_read_text_batch_empty(self):
+        """Test that an empty batch skips the reader."""
+        client = EasyOCRClient.__new__(EasyOCRClient)
+        client.reader = MagicMock()
+
+        assert client.read_text_batch([]) == []
+        client.reader.readtext_batched.assert_not_called()
+
+    def test_batcher_coalesces_concurrent_requests(self):
+        """Test that concurrent requests are served by a single batch."""
+        client = MagicMock()
+        client.read_text_batch.side_effect = lambda images, batch_size, **kwargs: [
+            image.decode() for image in images
+        ]
+        batcher = OCRBatcher(client, max_batch_size=4, max_wait_ms=50)
+
+        async def run():
+            return await asyncio.gather(*(batcher.read_text(f"img{i}".encode()) for i in range(3)))
+
+        assert asyncio.run(run()) == ["img0", "img1", "img2"]
+        client.read_text_batch.assert_called_once()
+
+    def test_batcher_runs_lone_request_immediately(self):
+        """Test that a request to an idle batcher skips the batch window."""
+        client = MagicMock()
+        client.read_text.return_value = "single"
+        batcher = OCRBatcher(client, max_batch_size=4, max_wait_ms=60_000)
+
+        async def run():
+            return await asyncio.wait_for(batcher.read_text(b"img"), timeout=5)
+
+        assert asyncio.run(run()) == "single"
+        client.read_text.assert_called_once_with(b"img")
+        client.read_text_batch.assert_not_called()
+
+    def test_batcher_propagates_errors(self):
+        """Test that a failed batch fails every waiting request."""
+        client = MagicMock()
+        client.read_text_batch.side_effect = RuntimeError("OCR failed")
+        batcher = OCRBatcher(client, max_batch_size=2, max_wait_ms=10)
+
+        async def run():
+            return await asyncio.gather(
+                batcher.read_text(b"img0"), batcher.read_text(b"img1"), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_batcher_fails_only_the_bad_request(self):
+        """Test that an image-level error fails its own request but not its batch mates."""
+        client = MagicMock()
+        client.read_text_batch.side_effect = lambda images, batch_size, **kwargs: [
+            ValueError("corrupt") if image == b"bad" else image.decode() for image in images
+        ]
+        batcher = OCRBatcher(client, max_batch_size=4, max_wait_ms=50)
+
+        async def run():
+            return await asyncio.gather(
+                batcher.read_text(b"img0"),
+                batcher.read_text(b"bad"),
+                batcher.read_text(b"img2"),
+                return_exceptions=True,
+            )
+
+        first, bad, last = asyncio.run(run())
+        assert (first, last) == ("img0", "img2")
+        assert isinstance(bad, ValueError)
+        assert client.read_text_batch.call_args.kwargs == {"return_exceptions": True}
+
+    def test_batcher_close_stops_worker_thread(self):
+        """Test that closing the batcher waits for and shuts down its OCR thread."""
+        client = MagicMock()
+        client.read_text.return_value = "single"
+        batcher = OCRBatcher(client, max_batch_size=4, max_wait_ms=10)
+
+        async def run():
+            text = await batcher.read_text(b"img")
+            batcher.close()
+            return text
+
+        assert asyncio.run(run()) == "single"
+        assert batcher._worker is None
+        with pytest.raises(RuntimeError):
+            batcher._executor.submit(print)